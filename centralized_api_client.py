@@ -7,13 +7,233 @@ allowing services to use either the centralized service or direct API access.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type
 
 import requests
-from fogis_api_client import FogisApiClient
+
+from json_utils import loads as _loads
+
+_ijson: Optional[ModuleType]
+try:
+    import ijson
+
+    _ijson = ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    _ijson = None
+
+if TYPE_CHECKING:
+    from fogis_api_client import FogisApiClient
 
 logger = logging.getLogger(__name__)
 
+# FogisApiClient class, imported on first use since only direct mode needs it
+_FogisApiClient: Optional[Type["FogisApiClient"]] = None
+
+
+def _get_fogis_api_client_class() -> Type["FogisApiClient"]:
+    """
+    Import the direct FOGIS API client class on first use.
+
+    Returns:
+        FogisApiClient class
+    """
+    global _FogisApiClient
+    if _FogisApiClient is None:
+        from fogis_api_client import FogisApiClient
+
+        _FogisApiClient = FogisApiClient
+    return _FogisApiClient
+
+
+# Seconds a successful centralized health check is trusted before probing again
+HEALTH_CHECK_CACHE_SECONDS = 30.0
+
+# Bodies smaller than this are parsed in one go; larger ones are streamed
+STREAM_THRESHOLD_BYTES = 64 * 1024
+
+# Cache entry: (fetched at, ETag, Last-Modified, response payload)
+CacheEntry = Tuple[float, str, str, Dict[str, Any]]
+
+# Cache key for requests without filter parameters
+_EMPTY_CACHE_KEY: FrozenSet[Tuple[str, Any]] = frozenset()
+
+
+def _cache_key(params: Dict[str, Any]) -> FrozenSet[Tuple[str, Any]]:
+    """
+    Build a hashable cache key from query parameters.
+
+    Args:
+        params: Query parameters sent to the centralized service
+
+    Returns:
+        Frozen set of parameter items, with list values converted to tuples
+    """
+    return frozenset(
+        (key, tuple(value) if isinstance(value, list) else value) for key, value in params.items()
+    )
+
+
+def _decode_matches(response: requests.Response) -> Any:
+    """
+    Decode a matches response body.
+
+    Large (or chunked) bodies are parsed incrementally from the socket with ijson when
+    it is installed, so the raw bytes are never buffered in full. Either way the whole
+    document is decoded, so the result does not depend on the size of the body.
+
+    Args:
+        response: Streamed response from the centralized service
+
+    Returns:
+        Decoded list of matches
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    content_length = response.headers.get("Content-Length")
+    if _ijson is None or (
+        content_length is not None and int(content_length) < STREAM_THRESHOLD_BYTES
+    ):
+        return _loads(response.content)
+
+    response.raw.decode_content = True
+    try:
+        # The empty prefix yields the top-level value, whether it is a list or an object
+        for document in _ijson.items(response.raw, "", use_float=True):
+            return document
+    except _ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON in matches response: {e}") from e
+    raise ValueError("Empty matches response")
+
+
+class TokenBucket:
+    """Token bucket rate limiter that allows short bursts up to its capacity."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second; 0 or less disables the limit
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        Returns:
+            Time waited in seconds
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now; a negative balance is paid back by waiting
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait_time > 0:
+            logger.info("API rate limit reached. Waiting %.2f seconds.", wait_time)
+            time.sleep(wait_time)
+        return wait_time
+
+
+class BatchingFetcher:
+    """Coalesces match fetches issued within a short window into one concurrent batch.
+
+    Identical filter parameters within a batch share a single request.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Dict[str, Any]], Dict[str, Any]],
+        window: float = 0.05,
+        max_workers: int = 8,
+    ):
+        """
+        Initialize the batching fetcher.
+
+        Args:
+            fetch: Function that performs a single fetch for a set of filter parameters
+            window: Seconds to collect calls before dispatching them
+            max_workers: Maximum number of concurrent requests
+        """
+        self._fetch = fetch
+        self.window = window
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fogis-fetch"
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[FrozenSet[Tuple[str, Any]], "Future[Dict[str, Any]]"] = {}
+        self._batch: List[Tuple[Dict[str, Any], "Future[Dict[str, Any]]"]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def fetch(self, filter_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a fetch and wait for its result.
+
+        Args:
+            filter_params: Filter parameters for the matches
+
+        Returns:
+            JSON response containing matches data
+        """
+        key = _cache_key(filter_params)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+                self._batch.append((filter_params, future))
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self._dispatch)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return future.result()
+
+    def _dispatch(self) -> None:
+        """Send the collected batch to the worker pool."""
+        with self._lock:
+            batch, self._batch = self._batch, []
+            self._pending = {}
+            self._timer = None
+        for filter_params, future in batch:
+            self._executor.submit(self._run, filter_params, future)
+
+    def _run(self, filter_params: Dict[str, Any], future: "Future[Dict[str, Any]]") -> None:
+        """
+        Perform one fetch and resolve its future.
+
+        Args:
+            filter_params: Filter parameters for the matches
+            future: Future shared by every caller that asked for these parameters
+        """
+        try:
+            future.set_result(self._fetch(filter_params))
+        except Exception as e:
+            future.set_exception(e)
+
+    def close(self) -> None:
+        """Dispatch any queued calls and shut down the worker pool."""
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+            self._dispatch()
+        self._executor.shutdown(wait=True)
+
 
 class CentralizedFogisApiClient:
     """Centralized FOGIS API client.
@@ -26,6 +246,9 @@ class CentralizedFogisApiClient:
         api_client_url: Optional[str] = None,
         username: str = "",
         password: str = "",  # nosec B107
+        cache_ttl: float = 60.0,
+        rate_limit: int = 10,
+        batch_window: float = 0.0,
     ):
         """
         Initialize the centralized API client.
@@ -34,24 +257,105 @@ class CentralizedFogisApiClient:
             api_client_url: URL of the centralized FOGIS API client service
             username: FOGIS username (used for direct API access)
             password: FOGIS password (used for direct API access)
+            cache_ttl: Seconds a centralized matches response is reused without revalidation
+            rate_limit: Maximum number of requests per minute to the centralized service
+                (0 or less disables the limit)
+            batch_window: Seconds to collect concurrent fetches into one batch (0 disables)
         """
         self.api_client_url = api_client_url
         self.username = username
         self.password = password
-        self._direct_client: Optional[FogisApiClient] = None
+        self._direct_client: Optional["FogisApiClient"] = None
+        self._session: Optional[requests.Session] = None
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[FrozenSet[Tuple[str, Any]], CacheEntry] = {}
+        self._bucket = TokenBucket(rate=rate_limit / 60.0, capacity=rate_limit)
+        # The batcher is created on first use, and again after close()
+        self._batch_window = batch_window
+        self._batch_workers = max(1, min(8, rate_limit))
+        self._batcher: Optional[BatchingFetcher] = None
+        self._last_health_ok_at: Optional[float] = None
+        self._health_head_supported = True
 
         # Determine which mode to use
         self.use_centralized = bool(api_client_url and api_client_url.strip())
 
         if self.use_centralized:
-            logger.info(f"Using centralized FOGIS API client at: {self.api_client_url}")
+            logger.info("Using centralized FOGIS API client at: %s", self.api_client_url)
+            self._session = self._create_session()
         else:
             logger.info("Using direct FOGIS API client")
             if username and password:
-                self._direct_client = FogisApiClient(username, password)
+                self._direct_client = _get_fogis_api_client_class()(username, password)
             else:
                 logger.warning("No username/password provided for direct API access")
 
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """
+        Create a pooled HTTP session for talking to the centralized service.
+
+        Returns:
+            Session that keeps connections alive between requests
+        """
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        """
+        Get the HTTP session, recreating it if it was closed.
+
+        Returns:
+            Pooled HTTP session
+        """
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    def _get_batcher(self) -> Optional[BatchingFetcher]:
+        """
+        Get the batching fetcher, recreating it if it was closed.
+
+        Returns:
+            Batching fetcher, or None if batching is disabled
+        """
+        if self._batcher is None and self._batch_window > 0:
+            self._batcher = BatchingFetcher(
+                self._fetch_from_centralized_service,
+                window=self._batch_window,
+                max_workers=self._batch_workers,
+            )
+        return self._batcher
+
+    def close(self) -> None:
+        """
+        Close the HTTP session and release pooled connections.
+
+        The client stays usable: the session and batcher are recreated on the next request,
+        while cached responses and the health check result are kept.
+        """
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def login(self) -> bool:
         """
         Login to FOGIS API.
@@ -61,18 +365,41 @@ class CentralizedFogisApiClient:
         """
         if self.use_centralized:
             # For centralized service, login is handled by the service itself
+            now = time.monotonic()
+            if (
+                self._last_health_ok_at is not None
+                and now - self._last_health_ok_at < HEALTH_CHECK_CACHE_SECONDS
+            ):
+                return True
+
             try:
-                response = requests.get(f"{self.api_client_url}/health", timeout=10)
-                return response.status_code == 200
+                health_url = f"{self.api_client_url}/health"
+                session = self._get_session()
+                response = None
+                if self._health_head_supported:
+                    self._bucket.acquire()
+                    response = session.head(health_url, timeout=5, allow_redirects=False)
+                    if response.status_code == 405:
+                        # Not every server implements HEAD on /health; use GET from now on
+                        self._health_head_supported = False
+                        response = None
+                if response is None:
+                    self._bucket.acquire()
+                    response = session.get(health_url, timeout=5)
+
+                healthy = 200 <= response.status_code < 400
+                if healthy:
+                    self._last_health_ok_at = now
+                return healthy
             except requests.RequestException as e:
-                logger.error(f"Failed to connect to centralized API client: {e}")
+                logger.error("Failed to connect to centralized API client: %s", e)
                 return False
         else:
             if self._direct_client:
                 try:
                     return self._direct_client.login()
                 except Exception as e:
-                    logger.error(f"Direct API login failed: {e}")
+                    logger.error("Direct API login failed: %s", e)
                     return False
             return False
 
@@ -89,6 +416,9 @@ class CentralizedFogisApiClient:
             JSON response containing matches data
         """
         if self.use_centralized:
+            batcher = self._get_batcher()
+            if batcher is not None:
+                return batcher.fetch(filter_params or {})
             return self._fetch_from_centralized_service(filter_params)
         else:
             return self._fetch_from_direct_api(filter_params)
@@ -99,6 +429,10 @@ class CentralizedFogisApiClient:
         """
         Fetch matches from the centralized service.
 
+        Responses are cached per set of filter parameters. Within the cache TTL the
+        cached payload is returned directly; after that the request is revalidated
+        with If-None-Match/If-Modified-Since so an unchanged list comes back as 304.
+
         Args:
             filter_params: Filter parameters for the matches
 
@@ -108,31 +442,64 @@ class CentralizedFogisApiClient:
         try:
             url = f"{self.api_client_url}/matches"
 
-            # Add filter parameters as query parameters if provided
-            params = {}
+            # Add filter parameters as query parameters if provided, dropping None values.
+            # A dict without None values is used as-is; None skips the query string.
+            params: Optional[Dict[str, Any]] = None
             if filter_params:
-                # Convert filter_params to query parameters
-                for key, value in filter_params.items():
-                    if value is not None:
-                        params[key] = value
+                if any(value is None for value in filter_params.values()):
+                    params = {
+                        key: value for key, value in filter_params.items() if value is not None
+                    }
+                else:
+                    params = filter_params
 
-            logger.info(f"Fetching matches from centralized service: {url}")
+            logger.info("Fetching matches from centralized service: %s", url)
             if params:
-                logger.info(f"Using filter parameters: {params}")
+                logger.info("Using filter parameters: %s", params)
+
+            cache_key = _cache_key(params) if params else _EMPTY_CACHE_KEY
+            cached = self._cache.get(cache_key)
+            now = time.monotonic()
+            if cached is not None and now - cached[0] < self.cache_ttl:
+                logger.info("Using cached matches from centralized service")
+                return cached[3]
 
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            headers = {}
+            if cached is not None:
+                if cached[1]:
+                    headers["If-None-Match"] = cached[1]
+                if cached[2]:
+                    headers["If-Modified-Since"] = cached[2]
 
-            matches_data = response.json()
+            self._bucket.acquire()
+            response = self._get_session().get(
+                url, params=params, headers=headers, stream=True, timeout=30
+            )
+            with response:
+                if response.status_code == 304 and cached is not None:
+                    logger.info("Matches unchanged on centralized service, reusing cached response")
+                    self._cache[cache_key] = (now, cached[1], cached[2], cached[3])
+                    return cached[3]
+                response.raise_for_status()
+
+                matches_data = _decode_matches(response)
             logger.info(
-                f"Successfully fetched {len(matches_data)} matches from centralized service"
+                "Successfully fetched %d matches from centralized service", len(matches_data)
             )
 
             # Return in the expected format
-            return {"matches": matches_data, "total": len(matches_data), "status": "success"}
+            result = {"matches": matches_data, "total": len(matches_data), "status": "success"}
+            self._cache[cache_key] = (
+                now,
+                response.headers.get("ETag", ""),
+                response.headers.get("Last-Modified", ""),
+                result,
+            )
+            return result
 
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch matches from centralized service: {e}")
+        except (requests.RequestException, ValueError) as e:
+            # ValueError covers malformed JSON bodies from either decoder
+            logger.error("Failed to fetch matches from centralized service: %s", e)
             return {"matches": [], "total": 0, "status": "error", "error": str(e)}
 
     def _fetch_from_direct_api(
@@ -161,5 +528,5 @@ class CentralizedFogisApiClient:
             return self._direct_client.fetch_matches_list_json(filter_params=filter_params)
 
         except Exception as e:
-            logger.error(f"Failed to fetch matches from direct API: {e}")
+            logger.error("Failed to fetch matches from direct API: %s", e)
             return {"matches": [], "total": 0, "status": "error", "error": str(e)}
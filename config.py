@@ -5,22 +5,28 @@ Configuration module for the match list change detector.
 Provides functions to load and access configuration from environment variables.
 """
 
+import functools
 import os
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 
 # Default configuration
-DEFAULT_CONFIG = {
+_DEFAULTS: Dict[str, Any] = {
     # API credentials
     "FOGIS_USERNAME": "",
     "FOGIS_PASSWORD": "",
     # Centralized API client URL (takes precedence over direct API access)
     "FOGIS_API_CLIENT_URL": "",
+    "CENTRALIZED_CACHE_TTL": 60,  # Seconds to reuse a centralized matches response
+    "CENTRALIZED_BATCH_WINDOW": 0.0,  # Seconds to batch concurrent fetches (0 disables)
     # Match list configuration
     "DAYS_BACK": 7,
     "DAYS_AHEAD": 365,
     # File paths
     "PREVIOUS_MATCHES_FILE": "previous_matches.json",
     "DOCKER_COMPOSE_FILE": "../MatchListProcessor/docker-compose.yml",
+    # Pass small change sets to docker compose as MATCH_CHANGES instead of a file
+    "MATCH_CHANGES_IN_ENV": False,
     # Logging configuration
     "LOG_LEVEL": "INFO",
     "LOG_DIR": "logs",
@@ -35,10 +41,53 @@ DEFAULT_CONFIG = {
     "SSL_KEY_FILE": "certs/server.key",
     "HEALTH_SERVER_PORT": 8000,
     "METRICS_SERVER_PORT": 8001,
+    "METRICS_CACHE_TTL": 2.0,  # Seconds a rendered /metrics response is reused
     # Rate limiting
     "API_RATE_LIMIT": 10,  # Maximum number of API requests per minute
 }
 
+# Read-only view of the defaults so they cannot be mutated by accident
+DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType(_DEFAULTS)
+
+
+def _to_bool(value: str) -> bool:
+    """
+    Convert an environment variable string to a boolean.
+
+    Args:
+        value: Raw environment variable value
+
+    Returns:
+        True for "true", "yes" or "1" (case-insensitive), False otherwise
+    """
+    return value.lower() in {"true", "yes", "1"}
+
+
+def _caster_for(default_value: Any) -> Callable[[str], Any]:
+    """
+    Pick the function that converts an environment string to the type of a default.
+
+    Args:
+        default_value: Default configuration value
+
+    Returns:
+        Conversion function for environment variable values
+    """
+    # bool must be checked before int since bool is a subclass of int
+    if isinstance(default_value, bool):
+        return _to_bool
+    if isinstance(default_value, int):
+        return int
+    if isinstance(default_value, float):
+        return float
+    return str
+
+
+# Conversion function per configuration key, derived once from the defaults
+_TYPE_TABLE: Dict[str, Callable[[str], Any]] = {
+    key: _caster_for(value) for key, value in DEFAULT_CONFIG.items()
+}
+
 
 class Config:
     """Configuration manager for the application."""
@@ -51,26 +100,23 @@ class Config:
             env_prefix: Prefix for environment variables
         """
         self.env_prefix = env_prefix
-        self._config = DEFAULT_CONFIG.copy()
+        self._config = dict(DEFAULT_CONFIG)
+        # (config key, environment variable name) pairs, built once per instance
+        self._env_keys = tuple(
+            (key, env_prefix + key if env_prefix else key) for key in DEFAULT_CONFIG
+        )
         self._load_from_env()
 
     def _load_from_env(self) -> None:
         """Load configuration from environment variables."""
-        for key in self._config:
-            env_key = f"{self.env_prefix}{key}" if self.env_prefix else key
-            env_value = os.environ.get(env_key)
-
-            if env_value is not None:
-                # Convert to the appropriate type based on the default value
-                default_value = self._config[key]
-                if isinstance(default_value, bool):
-                    self._config[key] = env_value.lower() in ("true", "yes", "1")
-                elif isinstance(default_value, int):
-                    self._config[key] = int(env_value)
-                elif isinstance(default_value, float):
-                    self._config[key] = float(env_value)
-                else:
-                    self._config[key] = env_value
+        environ = os.environ
+        config = self._config
+        for key, env_key in self._env_keys:
+            env_value = environ.get(env_key)
+            if env_value is None:
+                continue
+            # Convert to the appropriate type based on the default value
+            config[key] = _TYPE_TABLE[key](env_value)
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -95,9 +141,20 @@ class Config:
         """
         self._config[key] = value
 
-    def as_dict(self) -> Dict[str, Any]:
+    def as_dict(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of the configuration.
+
+        The view reflects later changes made with set().
+
+        Returns:
+            Read-only configuration mapping
         """
-        Get the configuration as a dictionary.
+        return MappingProxyType(self._config)
+
+    def as_mutable_dict(self) -> Dict[str, Any]:
+        """
+        Get a copy of the configuration as a dictionary.
 
         Returns:
             Configuration dictionary
@@ -105,15 +162,46 @@ class Config:
         return self._config.copy()
 
 
-# Create a global configuration instance
-config = Config()
+@functools.lru_cache(maxsize=None)
+def _get_prefixed_config(env_prefix: str) -> Config:
+    """
+    Get the shared configuration instance for an environment variable prefix.
+
+    Args:
+        env_prefix: Prefix for environment variables
+
+    Returns:
+        Configuration instance, created on first use
+    """
+    return Config(env_prefix)
 
 
-def get_config() -> Config:
+def get_config(env_prefix: str = "") -> Config:
     """
     Get the global configuration instance.
 
+    The instance is created on first call, so importing this module does not read
+    the environment.
+
+    Args:
+        env_prefix: Prefix for environment variables (defaults to the unprefixed global config)
+
     Returns:
         Configuration instance
     """
-    return config
+    return _get_prefixed_config(env_prefix)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolve the lazily created ``config`` module attribute (PEP 562).
+
+    Args:
+        name: Attribute name
+
+    Returns:
+        The global configuration instance for ``config``
+    """
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
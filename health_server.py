@@ -5,12 +5,14 @@ Simple health check server for the match list change detector.
 Provides a basic HTTP/HTTPS server that responds to health check requests.
 """
 
+import functools
 import logging
+import os
 import ssl
 import threading
-from pathlib import Path
+from socketserver import ThreadingMixIn
 from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple, cast
-from wsgiref.simple_server import make_server
+from wsgiref.simple_server import WSGIServer, make_server
 
 
 # Define StartResponse type for WSGI
@@ -24,12 +26,18 @@ class StartResponse(Protocol):
         ...
 
 
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server that handles each request in its own thread."""
+
+    daemon_threads = True
+
+
 # Get logger
 logger = logging.getLogger("health_server")
 
 
 # Security headers for all responses
-SECURITY_HEADERS = [
+SECURITY_HEADERS: Tuple[Tuple[str, str], ...] = (
     ("Content-Type", "application/json"),
     ("X-Content-Type-Options", "nosniff"),
     ("X-Frame-Options", "DENY"),
@@ -38,25 +46,72 @@ SECURITY_HEADERS = [
     ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
     ("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0"),
     ("Pragma", "no-cache"),
-]
+)
+
+# Recommended TLS cipher suites for the HTTPS health server
+_CIPHERS = (
+    "ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:"
+    "ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:"
+    "ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305"
+)
+
+# Health check response body and headers, shared by all requests
+_OK_BODY: Tuple[bytes, ...] = (b'{"status":"ok"}',)
+# With Content-Length set up front the server does not have to add it to every response
+_OK_HEADERS: Tuple[Tuple[str, str], ...] = SECURITY_HEADERS + (
+    ("Content-Length", str(len(_OK_BODY[0]))),
+)
 
 
 # Health check endpoint handler
-def health_check_handler(environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+def health_check_handler(
+    environ: Dict[str, Any],
+    start_response: StartResponse,
+    _headers: Tuple[Tuple[str, str], ...] = _OK_HEADERS,
+    _body: Tuple[bytes, ...] = _OK_BODY,
+) -> Iterable[bytes]:
     """
     Handle health check requests.
 
     Args:
         environ: WSGI environment
         start_response: WSGI start_response function
+        _headers: Response headers (bound at definition time for fast lookup)
+        _body: Response body (bound at definition time for fast lookup)
 
     Returns:
         Response body
 
     """
-    status = "200 OK"
-    start_response(status, SECURITY_HEADERS)
-    return [b'{"status":"ok"}']
+    # wsgiref requires the headers to be a list, so hand it a fresh copy
+    start_response("200 OK", list(_headers))
+    return _body
+
+
+@functools.lru_cache(maxsize=4)
+def _make_ssl_context(cert_file: str, key_file: str, ciphers: str = _CIPHERS) -> ssl.SSLContext:
+    """
+    Build the server-side SSL context used for HTTPS.
+
+    The context is cached per certificate/key pair so restarting the server does not
+    reparse the certificate chain. Replaced certificates are picked up on process restart.
+
+    Args:
+        cert_file: Path to SSL certificate file
+        key_file: Path to SSL key file
+        ciphers: OpenSSL cipher string
+
+    Returns:
+        SSL context restricted to TLS 1.2+ with the given cipher suites
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    # Set minimum TLS version to TLS 1.2
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.set_ciphers(ciphers)
+    # Disable TLS compression and prefer our cipher order over the client's
+    context.options |= ssl.OP_NO_COMPRESSION | ssl.OP_CIPHER_SERVER_PREFERENCE
+    context.load_cert_chain(cert_file, key_file)
+    return context
 
 
 class HealthServer:
@@ -101,10 +156,11 @@ class HealthServer:
                 self.use_https = False
             else:
                 # Check if certificate and key files exist
-                cert_path = Path(self.cert_file)
-                key_path = Path(self.key_file)
-                if not cert_path.exists() or not key_path.exists():
-                    logger.warning(f"SSL certificate or key file not found. Falling back to HTTP.")
+                try:
+                    os.stat(self.cert_file)
+                    os.stat(self.key_file)
+                except OSError:
+                    logger.warning("SSL certificate or key file not found. Falling back to HTTP.")
                     self.use_https = False
 
     def start(self) -> None:
@@ -115,35 +171,26 @@ class HealthServer:
         def run_server() -> None:
             # Use cast to satisfy mypy's type checking for the WSGI handler
             handler: Any = health_check_handler
-            self.server = make_server(
-                "", self.port, cast(Callable[[Dict[str, Any], Any], Iterable[bytes]], handler)
+            server = make_server(
+                "",
+                self.port,
+                cast(Callable[[Dict[str, Any], Any], Iterable[bytes]], handler),
+                server_class=ThreadingWSGIServer,
             )
 
             # Configure SSL if HTTPS is enabled
             if self.use_https and self.cert_file and self.key_file:
                 try:
-                    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-                    # Set minimum TLS version to TLS 1.2
-                    context.minimum_version = ssl.TLSVersion.TLSv1_2
-                    # Set recommended cipher suites
-                    context.set_ciphers(
-                        "ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:"
-                        "ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384:"
-                        "ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305"
-                    )
-                    context.load_cert_chain(self.cert_file, self.key_file)
-                    if self.server and self.server.socket:
-                        self.server.socket = context.wrap_socket(
-                            self.server.socket, server_side=True
-                        )
-                        logger.info(f"Health server started with HTTPS on port {self.port}")
+                    context = _make_ssl_context(self.cert_file, self.key_file, _CIPHERS)
+                    server.socket = context.wrap_socket(server.socket, server_side=True)
+                    logger.info("Health server started with HTTPS on port %d", self.port)
                 except Exception as e:
-                    logger.error(f"Failed to configure HTTPS: {e}. Falling back to HTTP.")
+                    logger.error("Failed to configure HTTPS: %s. Falling back to HTTP.", e)
             else:
-                logger.info(f"Health server started with HTTP on port {self.port}")
+                logger.info("Health server started with HTTP on port %d", self.port)
 
-            if self.server:
-                self.server.serve_forever()
+            self.server = server
+            server.serve_forever()
 
         self.server_thread = threading.Thread(target=run_server)
         self.server_thread.daemon = True
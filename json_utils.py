@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+JSON helpers for the match list change detector.
+
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+JSONDecodeError = json.JSONDecodeError
+
+try:
+    import orjson
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """
+        Parse a JSON document.
+
+        Args:
+            data: JSON document as bytes or str
+
+        Returns:
+            Parsed JSON value
+        """
+        return orjson.loads(data)
+
+    def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """
+        Serialize a value to UTF-8 encoded JSON.
+
+        Args:
+            obj: Value to serialize
+            indent: Whether to pretty-print with two-space indentation
+            sort_keys: Whether to sort object keys, for a canonical encoding
+
+        Returns:
+            JSON document as bytes
+        """
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+except ImportError:  # pragma: no cover - orjson is optional
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """
+        Parse a JSON document.
+
+        Args:
+            data: JSON document as bytes or str
+
+        Returns:
+            Parsed JSON value
+        """
+        return json.loads(data)
+
+    def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        """
+        Serialize a value to UTF-8 encoded JSON.
+
+        Args:
+            obj: Value to serialize
+            indent: Whether to pretty-print with two-space indentation
+            sort_keys: Whether to sort object keys, for a canonical encoding
+
+        Returns:
+            JSON document as bytes
+        """
+        if indent:
+            text = json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+        else:
+            text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+        return text.encode("utf-8")
@@ -5,10 +5,14 @@ Logging configuration for the match list change detector.
 Provides functions to configure and access loggers.
 """
 
+import atexit
+import functools
+import io
 import logging
 import logging.handlers
 import os
-from typing import Optional
+import queue
+from typing import Any, Dict, List, Optional, TextIO
 
 # Constants
 DEFAULT_LOG_LEVEL = "INFO"
@@ -17,28 +21,160 @@ DEFAULT_LOG_DIR = "logs"
 DEFAULT_LOG_FILE = "match_list_change_detector.log"
 DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 DEFAULT_BACKUP_COUNT = 5
+DEFAULT_QUEUE_SIZE = 10000  # Maximum number of records waiting for the listener thread
+DEFAULT_FILE_BUFFER_SIZE = 1024 * 1024  # 1 MB write buffer for the log file
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that buffers writes instead of flushing every record.
+
+    The file size is tracked in-process, so checking for rollover does not seek the
+    stream (which would flush the buffer). Buffered records are written when the
+    handler is flushed, rotated or closed.
+    """
+
+    _size: int = 0
+
+    def _open(self) -> io.TextIOWrapper:
+        """Open the log file through a large write buffer."""
+        raw = open(self.baseFilename, self.mode + "b", buffering=DEFAULT_FILE_BUFFER_SIZE)
+        self._size = os.fstat(raw.fileno()).st_size
+        return io.TextIOWrapper(
+            raw,
+            encoding=self.encoding or "utf-8",
+            errors=self.errors,
+            newline="",
+            write_through=False,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record to the buffer, rotating the file first if it would grow too large."""
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes is a byte count, so measure non-ASCII text (team names) once encoded
+            size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or "utf-8"))
+            max_bytes = int(self.maxBytes)
+            if max_bytes > 0 and self._size and self._size + size >= max_bytes:
+                self.doRollover()
+            # typeshed declares stream non-optional, but close() and doRollover() reset it
+            stream: Optional[TextIO] = self.stream
+            if stream is None:
+                stream = self.stream = self._open()
+            stream.write(msg)
+            self._size += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _PrecompiledFormatter(logging.Formatter):
+    """Formatter that checks its format string for asctime once instead of on every record."""
+
+    def __init__(self, fmt: Optional[str] = None) -> None:
+        """Initialize the formatter and precompute whether it needs the record time."""
+        super().__init__(fmt)
+        self._uses_time = self._style.usesTime()
+
+    def usesTime(self) -> bool:
+        """Return whether the format string includes asctime."""
+        return self._uses_time
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue runs empty."""
+
+    def dequeue(self, block: bool) -> Any:
+        """Get the next record, flushing buffered output before waiting for one."""
+        if block:
+            try:
+                return self.queue.get_nowait()
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+        return self.queue.get(block)
+
+    def enqueue_sentinel(self) -> None:
+        """Queue the stop marker, waiting for room since the queue is bounded."""
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records quietly, and counts them, when the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        """Initialize the handler with no dropped records."""
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, dropping it instead of reporting an error if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Called under the handler lock, so the count needs no lock of its own
+            self.dropped += 1
+
+
+# Background listeners that own the real handlers, keyed by logger name
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _env_log_level_name() -> str:
+    """Read the LOG_LEVEL environment variable once."""
+    return os.environ.get("LOG_LEVEL") or DEFAULT_LOG_LEVEL
+
+
+@functools.lru_cache(maxsize=None)
+def _env_log_dir() -> str:
+    """Read the LOG_DIR environment variable once."""
+    return os.environ.get("LOG_DIR", DEFAULT_LOG_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_log_file() -> str:
+    """Read the LOG_FILE environment variable once."""
+    return os.environ.get("LOG_FILE", DEFAULT_LOG_FILE)
+
+
+@functools.lru_cache(maxsize=32)
+def _log_path(log_dir: str, log_file: str) -> str:
+    """
+    Create the log directory if needed and return the log file path.
+
+    Cached, so the directory is only checked once per process for each path.
+
+    Args:
+        log_dir: Directory to store log files
+        log_file: Log file name
+
+    Returns:
+        Path of the log file
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, log_file)
 
 
 def get_log_level(level_name: Optional[str] = None) -> int:
     """Convert a log level name to a logging level value."""
-    level_name_str = DEFAULT_LOG_LEVEL
-    if level_name is not None:
-        level_name_str = level_name
-    elif os.environ.get("LOG_LEVEL") is not None:
-        env_level = os.environ.get("LOG_LEVEL")
-        if env_level is not None:  # This is for mypy
-            level_name_str = env_level
-    level_name_str = level_name_str.upper()
-
-    level_map = {
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR,
-        "CRITICAL": logging.CRITICAL,
-    }
-
-    return level_map.get(level_name_str, logging.INFO)
+    # getLevelName maps registered level names to their numeric value
+    level = logging.getLevelName((level_name or _env_log_level_name()).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+@functools.lru_cache(maxsize=4)
+def _get_formatter(log_format: str) -> logging.Formatter:
+    """
+    Get a formatter for a format string, shared across handlers and loggers.
+
+    Args:
+        log_format: Log format string
+
+    Returns:
+        Formatter instance
+    """
+    return _PrecompiledFormatter(log_format)
 
 
 def configure_logging(
@@ -52,6 +188,9 @@ def configure_logging(
     """
     Configure logging for the application.
 
+    The logger only gets a QueueHandler; the file and console handlers run on a
+    background QueueListener thread so logging calls never block on I/O.
+
     Args:
         logger_name: Name of the logger
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -67,57 +206,74 @@ def configure_logging(
     logger = logging.getLogger(logger_name)
     logger.setLevel(get_log_level(log_level))
 
-    # Clear existing handlers
+    # Clear existing handlers and stop the listener that served them
     logger.handlers = []
+    old_listener = _queue_listeners.pop(logger_name, None)
+    if old_listener is not None:
+        old_listener.stop()
+        for handler in old_listener.handlers:
+            handler.close()
 
     # Create formatter
-    formatter = logging.Formatter(log_format or DEFAULT_LOG_FORMAT)
+    formatter = _get_formatter(log_format or DEFAULT_LOG_FORMAT)
 
     # Create file handler
-    log_dir_str = DEFAULT_LOG_DIR
-    if log_dir is not None:
-        log_dir_str = log_dir
-    elif os.environ.get("LOG_DIR") is not None:
-        env_dir = os.environ.get("LOG_DIR")
-        if env_dir is not None:  # This is for mypy
-            log_dir_str = env_dir
-
-    log_file_str = DEFAULT_LOG_FILE
-    if log_file is not None:
-        log_file_str = log_file
-    elif os.environ.get("LOG_FILE") is not None:
-        env_file = os.environ.get("LOG_FILE")
-        if env_file is not None:  # This is for mypy
-            log_file_str = env_file
+    log_dir_str = log_dir if log_dir is not None else _env_log_dir()
+    log_file_str = log_file if log_file is not None else _env_log_file()
 
     # Create log directory if it doesn't exist
-    os.makedirs(log_dir_str, exist_ok=True)
-
-    log_path = os.path.join(log_dir_str, log_file_str)
+    log_path = _log_path(log_dir_str, log_file_str)
 
     # Use a rotating file handler to prevent logs from growing too large
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_path, maxBytes=DEFAULT_MAX_BYTES, backupCount=DEFAULT_BACKUP_COUNT
+    file_handler = BufferedRotatingFileHandler(
+        log_path, maxBytes=DEFAULT_MAX_BYTES, backupCount=DEFAULT_BACKUP_COUNT, delay=True
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    handlers: List[logging.Handler] = [file_handler]
 
     # Add console handler if requested
     if console_output:
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    # Hand records to the real handlers on a background thread
+    # Bounded so a stalled disk cannot grow memory without limit
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=DEFAULT_QUEUE_SIZE)
+    listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners[logger_name] = listener
+    logger.addHandler(_DroppingQueueHandler(log_queue))
 
-    logger.info(f"Logging configured with level {log_level or DEFAULT_LOG_LEVEL}")
+    logger.info("Logging configured with level %s", log_level or DEFAULT_LOG_LEVEL)
 
     return logger
 
 
+def shutdown_logging() -> None:
+    """Stop all background log listeners, flushing any queued records."""
+    while _queue_listeners:
+        _, listener = _queue_listeners.popitem()
+        listener.stop()
+        for handler in listener.handlers:
+            # Streams may already be closed at exit, as in logging.shutdown()
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass
+
+
+# Make sure queued records are written before the interpreter exits
+atexit.register(shutdown_logging)
+
+
+@functools.lru_cache(maxsize=128)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger with the given name.
 
     If the logger doesn't exist, it will be created with default configuration.
+    Loggers are cached per name, so repeated calls skip the logging module lock.
 
     Args:
         name: Logger name (defaults to root logger name)
@@ -5,22 +5,59 @@ Match list change detector for the Fogis API.
 Detects changes in match lists and triggers actions when changes are found.
 """
 
-import json
+import functools
+import hashlib
+import logging
+import operator
+import os
 import shutil
 import subprocess  # nosec B404
+import tempfile
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
-
-from fogis_api_client import MatchListFilter
+from types import ModuleType
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
+import json_utils
 from centralized_api_client import CentralizedFogisApiClient
 from config import get_config
 from health_server import HealthServer
 from logging_config import get_logger
 from metrics import metrics
 
+_ijson: Optional[ModuleType]
+try:
+    import ijson
+
+    _ijson = ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    _ijson = None
+
+_xxhash: Any
+try:
+    import xxhash as _xxhash
+except ImportError:  # pragma: no cover - xxhash is optional
+    _xxhash = None
+
 
 class MatchChangeRecord(TypedDict):
     """Type definition for a match change record."""
@@ -30,6 +67,8 @@ class MatchChangeRecord(TypedDict):
     previous: Dict[str, Any]
     current: Dict[str, Any]
     changes: Dict[str, bool]
+    referees_added: List[Dict[str, Any]]
+    referees_removed: List[Dict[str, Any]]
 
 
 class ChangesSummary(TypedDict):
@@ -49,26 +88,271 @@ config = get_config()
 # Get logger
 logger = get_logger("match_list_change_detector")
 
-# Start health server with HTTPS if configured
-use_https = config.get("USE_HTTPS", False)
-health_server_port = config.get("HEALTH_SERVER_PORT", 8000)
-ssl_cert_file = config.get("SSL_CERT_FILE") if use_https else None
-ssl_key_file = config.get("SSL_KEY_FILE") if use_https else None
-
-health_server = HealthServer(
-    port=health_server_port, use_https=use_https, cert_file=ssl_cert_file, key_file=ssl_key_file
-)
-health_server.start()
-
 # Constants
 PREVIOUS_MATCHES_FILE = config.get("PREVIOUS_MATCHES_FILE")
 DOCKER_COMPOSE_FILE = config.get("DOCKER_COMPOSE_FILE")
+MATCH_CHANGES_IN_ENV = config.get("MATCH_CHANGES_IN_ENV", False)
+# Largest change set passed in the environment, well below the per-variable limit
+MATCH_CHANGES_ENV_MAX_BYTES = 100 * 1024
+# Suffix of the file holding match digests next to the previous matches file
+DIGESTS_SUFFIX = ".digests.json"
+# Seconds to wait for docker-compose to fail before leaving it running in the background
+DOCKER_COMPOSE_CHECK_SECONDS = 2
+# Previous matches files at least this large are parsed incrementally
+STREAM_THRESHOLD_BYTES = 1024 * 1024
 FOGIS_USERNAME = config.get("FOGIS_USERNAME")
 FOGIS_PASSWORD = config.get("FOGIS_PASSWORD")
 DAYS_BACK = config.get("DAYS_BACK")
 DAYS_AHEAD = config.get("DAYS_AHEAD")
 
 
+# Match fields that count as a basic change when they differ
+_BASIC_KEYS = (
+    "speldatum",
+    "avsparkstid",
+    "anlaggningnamn",
+    "installd",
+    "avbruten",
+    "uppskjuten",
+    "lag1lagid",
+    "lag2lagid",
+)
+_basic_getter = operator.itemgetter(*_BASIC_KEYS)
+
+# Referee fields copied into change records, as (change record name, API key) pairs
+_REFEREE_FIELDS = (
+    ("id", "domareid"),
+    ("name", "personnamn"),
+    ("role", "domarrollnamn"),
+    ("email", "epostadress"),
+    ("phone", "mobiltelefon"),
+)
+_REFEREE_NAMES = tuple(name for name, _ in _REFEREE_FIELDS)
+_REFEREE_KEYS = tuple(key for _, key in _REFEREE_FIELDS)
+_referee_getter = operator.itemgetter(*_REFEREE_KEYS)
+
+
+def _basic_tuple(match: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Get the basic match fields as a tuple for a single comparison.
+
+    Args:
+        match: Match dictionary from the API
+
+    Returns:
+        Values of the basic match fields
+
+    """
+    try:
+        # itemgetter with several keys always returns a tuple
+        return cast(Tuple[Any, ...], _basic_getter(match))
+    except KeyError:
+        # Missing fields compare as None
+        return tuple(match.get(key) for key in _BASIC_KEYS)
+
+
+def _referee_ids(match: Dict[str, Any]) -> FrozenSet[Any]:
+    """Get the IDs of the referees assigned to a match.
+
+    Args:
+        match: Match dictionary from the API
+
+    Returns:
+        Referee IDs
+
+    """
+    return frozenset(referee.get("domareid") for referee in match.get("domaruppdraglista") or ())
+
+
+def _match_signature(match: Dict[str, Any]) -> Tuple[Tuple[Any, ...], FrozenSet[Any]]:
+    """Get everything a change is detected on, so unchanged matches compare in one step.
+
+    Args:
+        match: Match dictionary from the API
+
+    Returns:
+        Basic match fields and referee IDs
+
+    """
+    return _basic_tuple(match), _referee_ids(match)
+
+
+def _data_digest(data: bytes) -> str:
+    """Get a digest of some bytes that is stable across runs.
+
+    Args:
+        data: Bytes to digest
+
+    Returns:
+        Hex digest of the bytes
+
+    """
+    if _xxhash is not None:
+        return cast(str, _xxhash.xxh3_128_hexdigest(data))
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _file_digest(f: BinaryIO) -> str:
+    """Get the same digest as _data_digest for an open file, reading it in chunks.
+
+    Args:
+        f: File opened in binary mode, positioned at the start
+
+    Returns:
+        Hex digest of the file contents
+
+    """
+    hasher = _xxhash.xxh3_128() if _xxhash is not None else hashlib.blake2b(digest_size=16)
+    for chunk in iter(functools.partial(f.read, 1024 * 1024), b""):
+        hasher.update(chunk)
+    return cast(str, hasher.hexdigest())
+
+
+def _match_digest(match: Dict[str, Any]) -> str:
+    """Get a digest of a match that is stable across runs.
+
+    Args:
+        match: Match dictionary from the API
+
+    Returns:
+        Hex digest of the match serialized as JSON with sorted keys
+
+    """
+    return _data_digest(json_utils.dumps(match, sort_keys=True))
+
+
+def _match_digests(matches: Iterable[Dict[str, Any]]) -> Dict[Any, str]:
+    """Get the digests of a list of matches.
+
+    Args:
+        matches: Match dictionaries from the API
+
+    Returns:
+        Match digests keyed by match ID
+
+    """
+    return {match["matchid"]: _match_digest(match) for match in matches}
+
+
+def _stream_saved_matches(f: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Parse saved matches one at a time from an open previous matches file.
+
+    Args:
+        f: Previous matches file opened in binary mode
+
+    Returns:
+        Iterator over the saved match dictionaries
+
+    """
+    if _ijson is None:
+        raise ImportError("ijson is required to stream saved matches")
+    # Matches are saved keyed by match ID; older files hold a plain list
+    keyed = f.read(1) == b"{"
+    f.seek(0)
+    if keyed:
+        return (match for _, match in _ijson.kvitems(f, "", use_float=True))
+    return cast(Iterator[Dict[str, Any]], _ijson.items(f, "item", use_float=True))
+
+
+def _read_output(output: Optional[IO[bytes]]) -> str:
+    """Read and close a temporary file holding process output.
+
+    Args:
+        output: Temporary file the process wrote to, or None if the output was discarded
+
+    Returns:
+        Output decoded as UTF-8
+
+    """
+    if output is None:
+        return ""
+    with output:
+        output.seek(0)
+        return output.read().decode("utf-8", errors="replace")
+
+
+def _wait_for_docker_compose(
+    process: "subprocess.Popen[bytes]", stdout: Optional[IO[bytes]], stderr: IO[bytes]
+) -> None:
+    """Wait for a docker-compose process that is still running and log how it ended.
+
+    Args:
+        process: Running docker-compose process
+        stdout: Temporary file receiving its stdout, or None if discarded
+        stderr: Temporary file receiving its stderr
+
+    """
+    process.wait()
+    stdout_text, stderr_text = _read_output(stdout), _read_output(stderr)
+    if process.returncode == 0:
+        logger.info("docker-compose completed")
+        logger.debug("docker-compose output: %s", stdout_text)
+    else:
+        logger.error("Error triggering docker-compose: %s", stderr_text)
+
+
+def _match_snapshot(match: Dict[str, Any], basic: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Build the previous/current section of a change record.
+
+    Args:
+        match: Match dictionary from the API
+        basic: Values of the basic match fields, as returned by _basic_tuple
+
+    Returns:
+        Match details including teams and status
+
+    """
+    match_date, kickoff, venue, _, _, _, home_id, away_id = basic
+    return {
+        "date": match_date,
+        "time": kickoff,
+        "home_team": {"id": home_id, "name": match.get("lag1namn")},
+        "away_team": {"id": away_id, "name": match.get("lag2namn")},
+        "venue": venue,
+        # Raw values, so None and 0 are reported as sent; False only when missing
+        "status": {
+            "cancelled": match.get("installd", False),
+            "interrupted": match.get("avbruten", False),
+            "postponed": match.get("uppskjuten", False),
+        },
+    }
+
+
+def _referee_details(match: Dict[str, Any], referee_ids: FrozenSet[Any]) -> List[Dict[str, Any]]:
+    """Get the details of the given referees assigned to a match.
+
+    Args:
+        match: Match dictionary from the API
+        referee_ids: IDs of the referees to include
+
+    Returns:
+        Referee details in assignment order
+
+    """
+    return [
+        _referee_detail(referee)
+        for referee in match.get("domaruppdraglista") or ()
+        if referee.get("domareid") in referee_ids
+    ]
+
+
+def _referee_detail(referee: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the change record details of a single referee assignment.
+
+    Args:
+        referee: Referee assignment from a match's domaruppdraglista
+
+    Returns:
+        Referee ID, name, role and contact details
+
+    """
+    try:
+        values = _referee_getter(referee)
+    except KeyError:
+        # Missing fields are reported as None
+        values = tuple(referee.get(key) for key in _REFEREE_KEYS)
+    return dict(zip(_REFEREE_NAMES, values))
+
+
 def get_executable_path(executable: str) -> Optional[str]:
     """Find the absolute path of an executable.
 
@@ -81,11 +365,45 @@ def get_executable_path(executable: str) -> Optional[str]:
     """
     executable_path = shutil.which(executable)
     if executable_path is None:
-        logger.error(f"Could not find executable: {executable}")
+        logger.error("Could not find executable: %s", executable)
         return None
     return executable_path
 
 
+@functools.lru_cache(maxsize=None)
+def get_docker_compose_command() -> Optional[Tuple[str, ...]]:
+    """Find the command that runs docker compose, looked up once per process.
+
+    Prefers the docker compose plugin, which saves starting the standalone
+    docker-compose binary, and falls back to docker-compose when the plugin
+    is not installed.
+
+    Returns:
+        Command with absolute executable path, or None if neither is available
+
+    """
+    docker_path = shutil.which("docker")
+    if docker_path is not None:
+        try:
+            # Only the docker CLI itself is guaranteed, the compose plugin may be missing
+            result = subprocess.run(  # nosec B603
+                [docker_path, "compose", "version"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+                check=False,
+            )
+            if result.returncode == 0:
+                return docker_path, "compose"
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    docker_compose_path = get_executable_path("docker-compose")
+    if docker_compose_path is None:
+        return None
+    return (docker_compose_path,)
+
+
 class RateLimiter:
     """Rate limiter for API requests."""
 
@@ -100,7 +418,7 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.request_timestamps: List[float] = []
+        self.request_timestamps: Deque[float] = deque(maxlen=max_requests)
 
     def can_make_request(self) -> bool:
         """
@@ -110,16 +428,16 @@ class RateLimiter:
             True if the request can be made, False otherwise
 
         """
-        current_time = time.time()
+        current_time = time.monotonic()
 
-        # Remove timestamps older than the time window
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps if current_time - ts < self.time_window
-        ]
+        # Remove timestamps older than the time window; they are in arrival order
+        timestamps = self.request_timestamps
+        while timestamps and current_time - timestamps[0] >= self.time_window:
+            timestamps.popleft()
 
         # Check if we've reached the limit
-        if len(self.request_timestamps) < self.max_requests:
-            self.request_timestamps.append(current_time)
+        if len(timestamps) < self.max_requests:
+            timestamps.append(current_time)
             return True
 
         return False
@@ -135,17 +453,15 @@ class RateLimiter:
         if self.can_make_request():
             return 0.0
 
-        # Calculate how long to wait
-        current_time = time.time()
-        oldest_timestamp = self.request_timestamps[0]
-        wait_time = self.time_window - (current_time - oldest_timestamp) + 0.1  # Add a small buffer
+        # Wait until the oldest request leaves the window; the monotonic clock never jumps
+        wait_time = max(0.0, self.time_window - (time.monotonic() - self.request_timestamps[0]))
 
-        logger.info(f"Rate limit reached. Waiting {wait_time: .2f} seconds before next request.")
+        logger.info("Rate limit reached. Waiting %.2f seconds before next request.", wait_time)
         time.sleep(wait_time)
 
         # Add the new timestamp and remove the oldest one
-        self.request_timestamps.pop(0)
-        self.request_timestamps.append(time.time())
+        self.request_timestamps.popleft()
+        self.request_timestamps.append(time.monotonic())
 
         return float(wait_time)
 
@@ -170,26 +486,91 @@ def validate_file_path(
 
         # Check if the file must exist
         if must_exist and not path.exists():
-            logger.error(f"Required file does not exist: {path}")
+            logger.error("Required file does not exist: %s", path)
             return None
 
         # Create parent directory if needed
         if create_dir and not path.parent.exists():
             path.parent.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created directory: {path.parent}")
+            logger.info("Created directory: %s", path.parent)
 
         return path
     except (ValueError, OSError) as e:
-        logger.error(f"Invalid file path '{file_path}': {e}")
+        logger.error("Invalid file path '%s': %s", file_path, e)
         return None
 
 
+def write_file_atomic(path: Path, data: Union[bytes, Iterable[bytes]]) -> None:
+    """Write a file so readers see either the old or the new contents, never a partial write.
+
+    Args:
+        path: Path of the file to write
+        data: File contents, either whole or as chunks written one after another
+
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                f.writelines(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Do not leave a partial temporary file behind
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _iter_changes_json(changes: Union[ChangesSummary, Dict[str, Any]]) -> Iterator[bytes]:
+    """Serialize a changes summary piece by piece, one match or change record at a time.
+
+    Args:
+        changes: Changes summary from detect_changes
+
+    Returns:
+        Iterator over chunks of the JSON document
+
+    """
+    yield b"{"
+    for index, (key, value) in enumerate(changes.items()):
+        if index:
+            yield b","
+        yield json_utils.dumps(key)
+        yield b":"
+        if isinstance(value, list):
+            yield b"["
+            for item_index, item in enumerate(value):
+                if item_index:
+                    yield b","
+                yield json_utils.dumps(item)
+            yield b"]"
+        else:
+            yield json_utils.dumps(value)
+    yield b"}"
+
+
 class MatchListChangeDetector:
     """Detects changes in the match list and triggers actions when changes are found."""
 
+    __slots__ = (
+        "api_client",
+        "previous_matches_dict",
+        "current_matches_dict",
+        "previous_digests",
+        "current_digests",
+        "previous_matches_path",
+        "logged_in",
+        "rate_limiter",
+    )
+
     api_client: CentralizedFogisApiClient
-    previous_matches: List[Dict[str, Any]]
-    current_matches: List[Dict[str, Any]]
+    previous_matches_dict: Dict[Any, Dict[str, Any]]
+    current_matches_dict: Dict[Any, Dict[str, Any]]
+    previous_digests: Dict[Any, str]
+    current_digests: Dict[Any, str]
+    previous_matches_path: Optional[Path]
+    logged_in: bool
     rate_limiter: RateLimiter
 
     def __init__(self, username: str, password: str):
@@ -197,98 +578,202 @@ class MatchListChangeDetector:
         # Use centralized API client if URL is provided, otherwise use direct API
         api_client_url = config.get("FOGIS_API_CLIENT_URL")
         self.api_client = CentralizedFogisApiClient(
-            api_client_url=api_client_url, username=username, password=password
+            api_client_url=api_client_url,
+            username=username,
+            password=password,
+            cache_ttl=config.get("CENTRALIZED_CACHE_TTL", 60),
+            rate_limit=config.get("API_RATE_LIMIT", 10),
+            batch_window=config.get("CENTRALIZED_BATCH_WINDOW", 0.0),
         )
-        self.previous_matches = []
-        self.current_matches = []
+        self.previous_matches_dict = {}
+        self.current_matches_dict = {}
+        # Digests of the previous and current matches, keyed by match ID
+        self.previous_digests = {}
+        self.current_digests = {}
+        # Resolved once; load and save run on every cycle
+        self.previous_matches_path = validate_file_path(PREVIOUS_MATCHES_FILE, create_dir=True)
+        # Set after a successful login and cleared when a fetch fails
+        self.logged_in = False
 
         # Initialize rate limiter
         max_requests = config.get("API_RATE_LIMIT", 10)
         self.rate_limiter = RateLimiter(max_requests=max_requests)
 
+    @property
+    def previous_matches(self) -> List[Dict[str, Any]]:
+        """Previously saved matches, as a list."""
+        return list(self.previous_matches_dict.values())
+
+    @previous_matches.setter
+    def previous_matches(self, matches: List[Dict[str, Any]]) -> None:
+        """Replace the previous matches, dropping digests that belonged to the old ones."""
+        self.previous_matches_dict = {match["matchid"]: match for match in matches}
+        self.previous_digests = {}
+
+    @property
+    def current_matches(self) -> List[Dict[str, Any]]:
+        """Currently fetched matches, as a list."""
+        return list(self.current_matches_dict.values())
+
+    @current_matches.setter
+    def current_matches(self, matches: List[Dict[str, Any]]) -> None:
+        """Replace the current matches, dropping digests that belonged to the old ones."""
+        self.current_matches_dict = {match["matchid"]: match for match in matches}
+        self.current_digests = {}
+
     def load_previous_matches(self) -> bool:
         """Load the previously saved matches from file."""
+        # Forget an earlier run's matches, so a missing or broken file is not compared against
+        self.previous_matches_dict = {}
+        self.previous_digests = {}
         try:
-            # Validate the file path
-            file_path = validate_file_path(PREVIOUS_MATCHES_FILE, must_exist=False)
+            file_path = self.previous_matches_path
             if not file_path:
-                logger.error(f"Invalid previous matches file path: {PREVIOUS_MATCHES_FILE}")
+                logger.error("Invalid previous matches file path: %s", PREVIOUS_MATCHES_FILE)
                 return False
 
             if file_path.exists():
-                with open(file_path, "r") as f:
-                    self.previous_matches = json.load(f)
+                with open(file_path, "rb") as f:
+                    if _ijson is not None and file_path.stat().st_size >= STREAM_THRESHOLD_BYTES:
+                        # Build the dict as matches are parsed instead of from a full document
+                        matches = _stream_saved_matches(f)
+                        self.previous_matches_dict = {match["matchid"]: match for match in matches}
+                        f.seek(0)
+                        source_digest = _file_digest(f)
+                    else:
+                        data = f.read()
+                        saved = json_utils.loads(data)
+                        # Matches are saved keyed by match ID; older files hold a plain list
+                        matches = saved.values() if isinstance(saved, dict) else saved
+                        self.previous_matches_dict = {match["matchid"]: match for match in matches}
+                        source_digest = _data_digest(data)
+                self.previous_digests = self._load_previous_digests(file_path, source_digest)
                 logger.info(
-                    f"Loaded {len(self.previous_matches)} previous matches from " f"{file_path}"
+                    "Loaded %d previous matches from %s", len(self.previous_matches_dict), file_path
                 )
                 return True
             else:
-                logger.info(f"No previous matches file found at {file_path}")
+                logger.info("No previous matches file found at %s", file_path)
                 return False
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing previous matches file: {e}")
+        except json_utils.JSONDecodeError as e:
+            logger.error("Error parsing previous matches file: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Error loading previous matches: {e}")
+            logger.error("Error loading previous matches: %s", e)
             return False
 
+    def _load_previous_digests(self, file_path: Path, source_digest: str) -> Dict[Any, str]:
+        """
+        Load the digests saved alongside the previous matches.
+
+        Falls back to computing them when the digests file is missing, was built from
+        a different matches file, or does not cover exactly the loaded matches.
+
+        Args:
+            file_path: Path of the previous matches file
+            source_digest: Digest of the previous matches file contents
+
+        Returns:
+            Previous match digests keyed by match ID
+        """
+        try:
+            with open(file_path.with_suffix(DIGESTS_SUFFIX), "rb") as f:
+                saved = json_utils.loads(f.read())
+            if saved["source"] == source_digest:
+                digests = dict(saved["digests"])
+                if digests.keys() == self.previous_matches_dict.keys():
+                    return digests
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return _match_digests(self.previous_matches_dict.values())
+
     def save_current_matches(self) -> bool:
         """Save the current matches to file for future comparison."""
         try:
-            # Validate the file path
-            file_path = validate_file_path(PREVIOUS_MATCHES_FILE, create_dir=True)
+            file_path = self.previous_matches_path
             if not file_path:
-                logger.error(f"Invalid previous matches file path: {PREVIOUS_MATCHES_FILE}")
+                logger.error("Invalid previous matches file path: %s", PREVIOUS_MATCHES_FILE)
                 return False
 
-            with open(file_path, "w") as f:
-                # noinspection PyTypeChecker
-                json.dump(self.current_matches, f, indent=2)
-            logger.info(f"Saved {len(self.current_matches)} current matches to {file_path}")
+            # Compact output keyed by match ID, only read back by load_previous_matches
+            data = json_utils.dumps(
+                {str(match_id): match for match_id, match in self.current_matches_dict.items()}
+            )
+
+            # Save the digests too, so the next run does not have to recompute them. They
+            # are written first and tagged with the matches file they belong to, so a crash
+            # before the matches are written leaves digests that are ignored, not trusted
+            if not self.current_digests:
+                self.current_digests = _match_digests(self.current_matches_dict.values())
+            write_file_atomic(
+                file_path.with_suffix(DIGESTS_SUFFIX),
+                json_utils.dumps(
+                    {"source": _data_digest(data), "digests": list(self.current_digests.items())}
+                ),
+            )
+            write_file_atomic(file_path, data)
+            logger.info("Saved %d current matches to %s", len(self.current_matches_dict), file_path)
             return True
         except Exception as e:
-            logger.error(f"Error saving current matches: {e}")
+            logger.error("Error saving current matches: %s", e)
             return False
 
     def fetch_current_matches(self) -> bool:
         """Fetch the current list of matches from the API."""
         try:
-            # Apply rate limiting before login
-            self.rate_limiter.wait_for_next_request()
-
-            # Login to the API
-            with metrics.time_api_request():
-                self.api_client.login()
-            logger.info("Successfully logged in to the API")
-
-            # Create a filter for matches
-            today = datetime.today()
-            start_date = (today - timedelta(days=DAYS_BACK)).strftime("%Y-%m-%d")
-            end_date = (today + timedelta(days=DAYS_AHEAD)).strftime("%Y-%m-%d")
-
-            match_filter = MatchListFilter().start_date(start_date).end_date(end_date)
+            self.current_digests = {}
+
+            # Login to the API, once per session rather than on every run
+            if not self.logged_in:
+                # Apply rate limiting before login
+                self.rate_limiter.wait_for_next_request()
+
+                with metrics.time_api_request():
+                    self.logged_in = bool(self.api_client.login())
+                if self.logged_in:
+                    logger.info("Successfully logged in to the API")
+
+            # Create a filter for matches, the same payload MatchListFilter builds for a
+            # date range
+            today = date.today()
+            payload = {
+                "datumFran": (today - timedelta(days=DAYS_BACK)).isoformat(),
+                "datumTill": (today + timedelta(days=DAYS_AHEAD)).isoformat(),
+            }
 
             # Apply rate limiting before fetching matches
             self.rate_limiter.wait_for_next_request()
 
             # Fetch matches using direct API call (PyPI v0.5.3 compatibility)
             with metrics.time_api_request():
-                payload = match_filter.build_payload()
                 api_response = self.api_client.fetch_matches_list_json(filter_params=payload)
 
-                # Handle different response structures from PyPI package
-                if isinstance(api_response, dict) and "matches" in api_response:
-                    self.current_matches = api_response["matches"]
-                elif isinstance(api_response, list):
-                    self.current_matches = api_response
-                else:
-                    logger.error(f"Unexpected API response structure: {type(api_response)}")
-                    logger.debug(f"Response content: {api_response}")
-                    self.current_matches = []
-            logger.info(f"Successfully fetched {len(self.current_matches)} current matches")
+                # The client reports failures in the response instead of raising; the session
+                # may have expired, so log in again on the next run. Its empty match list is
+                # not the real one, so the fetch fails
+                if isinstance(api_response, dict) and api_response.get("status") == "error":
+                    logger.error("Error fetching current matches: %s", api_response.get("error"))
+                    self.logged_in = False
+                    return False
+
+                # Handle different response structures from PyPI package; the centralized
+                # client always wraps the matches, so try that shape first
+                try:
+                    matches = api_response["matches"]
+                except (TypeError, KeyError):
+                    if isinstance(api_response, list):
+                        matches = api_response
+                    else:
+                        logger.error("Unexpected API response structure: %s", type(api_response))
+                        logger.debug("Response content: %s", api_response)
+                        matches = []
+            # Outside the lookup above, so a match without an ID fails the fetch
+            self.current_matches = matches
+            logger.info("Successfully fetched %d current matches", len(self.current_matches_dict))
             return True
         except Exception as e:
-            logger.error(f"Error fetching current matches: {e}")
+            logger.error("Error fetching current matches: %s", e)
+            self.logged_in = False
             return False
 
     def detect_changes(self) -> Tuple[bool, Union[ChangesSummary, Dict[str, Any]]]:
@@ -300,130 +785,81 @@ class MatchListChangeDetector:
             - Boolean indicating if changes were detected
             - Dictionary with details about the changes
         """
-        if not self.previous_matches:
+        self.current_digests = _match_digests(self.current_matches_dict.values())
+
+        if not self.previous_matches_dict:
             logger.info("No previous matches to compare with, considering this as a change")
             return True, {
-                "new_matches": len(self.current_matches),
+                "new_matches": len(self.current_matches_dict),
                 "message": "Initial match list fetch",
             }
 
-        # Create dictionaries for easier comparison, using match ID as key
-        prev_matches_dict = {match["matchid"]: match for match in self.previous_matches}
-        curr_matches_dict = {match["matchid"]: match for match in self.current_matches}
+        # Same match IDs with the same digests as the loaded matches means nothing changed
+        if self.previous_digests and self.current_digests == self.previous_digests:
+            logger.info("No changes detected in match list")
+            return False, {
+                "new_matches": 0,
+                "removed_matches": 0,
+                "changed_matches": 0,
+                "new_match_details": [],
+                "removed_match_details": [],
+                "changed_match_details": [],
+            }
 
-        # Find new, removed, and changed matches
-        new_match_ids = set(curr_matches_dict.keys()) - set(prev_matches_dict.keys())
-        removed_match_ids = set(prev_matches_dict.keys()) - set(curr_matches_dict.keys())
-        common_match_ids = set(curr_matches_dict.keys()) & set(prev_matches_dict.keys())
+        # Both match lists are already keyed by match ID
+        prev_matches_dict = self.previous_matches_dict
+        curr_matches_dict = self.current_matches_dict
+
+        # Find new and removed matches (set operations work directly on dict key views)
+        new_match_ids = curr_matches_dict.keys() - prev_matches_dict.keys()
+        removed_match_ids = prev_matches_dict.keys() - curr_matches_dict.keys()
+
+        # Check for changes in matches present in both lists
+        # Iterate the smaller dict and probe the larger one for the same match ID
+        pairs: Iterator[Tuple[Any, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]
+        if len(prev_matches_dict) < len(curr_matches_dict):
+            pairs = (
+                (match_id, prev_match, curr_matches_dict.get(match_id))
+                for match_id, prev_match in prev_matches_dict.items()
+            )
+        else:
+            pairs = (
+                (match_id, prev_matches_dict.get(match_id), curr_match)
+                for match_id, curr_match in curr_matches_dict.items()
+            )
 
-        # Check for changes in common matches
         changed_matches = []
-        for match_id in common_match_ids:
-            prev_match = prev_matches_dict[match_id]
-            curr_match = curr_matches_dict[match_id]
+        for match_id, prev_match, curr_match in pairs:
+            if prev_match is None or curr_match is None:
+                continue
+
+            # Identical matches need no field-by-field comparison
+            if self.previous_digests.get(match_id) == self.current_digests[match_id]:
+                continue
 
             # Check for important changes (date, time, venue, referees, teams, status)
-            # Compare basic match details
-            basic_changes = (
-                prev_match.get("speldatum") != curr_match.get("speldatum")
-                or prev_match.get("avsparkstid") != curr_match.get("avsparkstid")
-                or prev_match.get("anlaggningnamn") != curr_match.get("anlaggningnamn")
-                or prev_match.get("installd") != curr_match.get("installd")
-                or prev_match.get("avbruten") != curr_match.get("avbruten")
-                or prev_match.get("uppskjuten") != curr_match.get("uppskjuten")
-                or prev_match.get("lag1lagid") != curr_match.get("lag1lagid")
-                or prev_match.get("lag2lagid") != curr_match.get("lag2lagid")
-            )
+            prev_signature = _match_signature(prev_match)
+            curr_signature = _match_signature(curr_match)
+            if prev_signature == curr_signature:
+                continue
+
+            (prev_basic, prev_refs), (curr_basic, curr_refs) = prev_signature, curr_signature
+            basic_changes = prev_basic != curr_basic
+            referee_changes = prev_refs != curr_refs
+
+            # Create a detailed change record, reusing the values read for the comparison
+            change_record = {
+                "match_id": match_id,
+                "match_nr": curr_match.get("matchnr"),
+                "previous": _match_snapshot(prev_match, prev_basic),
+                "current": _match_snapshot(curr_match, curr_basic),
+                "changes": {"basic": basic_changes, "referees": referee_changes},
+                # Only the referees that were assigned or unassigned
+                "referees_added": _referee_details(curr_match, curr_refs - prev_refs),
+                "referees_removed": _referee_details(prev_match, prev_refs - curr_refs),
+            }
 
-            # Compare referee assignments
-            prev_referee_ids = set()
-            curr_referee_ids = set()
-
-            # Extract referee IDs from previous match
-            if "domaruppdraglista" in prev_match:
-                for referee in prev_match["domaruppdraglista"]:
-                    prev_referee_ids.add(referee.get("domareid"))
-
-            # Extract referee IDs from current match
-            if "domaruppdraglista" in curr_match:
-                for referee in curr_match["domaruppdraglista"]:
-                    curr_referee_ids.add(referee.get("domareid"))
-
-            referee_changes = prev_referee_ids != curr_referee_ids
-
-            if basic_changes or referee_changes:
-                # Create a detailed change record
-                change_record = {
-                    "match_id": match_id,
-                    "match_nr": curr_match.get("matchnr"),
-                    "previous": {
-                        "date": prev_match.get("speldatum"),
-                        "time": prev_match.get("avsparkstid"),
-                        "home_team": {
-                            "id": prev_match.get("lag1lagid"),
-                            "name": prev_match.get("lag1namn"),
-                        },
-                        "away_team": {
-                            "id": prev_match.get("lag2lagid"),
-                            "name": prev_match.get("lag2namn"),
-                        },
-                        "venue": prev_match.get("anlaggningnamn"),
-                        "status": {
-                            "cancelled": prev_match.get("installd", False),
-                            "interrupted": prev_match.get("avbruten", False),
-                            "postponed": prev_match.get("uppskjuten", False),
-                        },
-                        "referees": [],
-                    },
-                    "current": {
-                        "date": curr_match.get("speldatum"),
-                        "time": curr_match.get("avsparkstid"),
-                        "home_team": {
-                            "id": curr_match.get("lag1lagid"),
-                            "name": curr_match.get("lag1namn"),
-                        },
-                        "away_team": {
-                            "id": curr_match.get("lag2lagid"),
-                            "name": curr_match.get("lag2namn"),
-                        },
-                        "venue": curr_match.get("anlaggningnamn"),
-                        "status": {
-                            "cancelled": curr_match.get("installd", False),
-                            "interrupted": curr_match.get("avbruten", False),
-                            "postponed": curr_match.get("uppskjuten", False),
-                        },
-                        "referees": [],
-                    },
-                    "changes": {"basic": basic_changes, "referees": referee_changes},
-                }
-
-                # Add referee details to previous match
-                if "domaruppdraglista" in prev_match:
-                    for referee in prev_match["domaruppdraglista"]:
-                        change_record["previous"]["referees"].append(
-                            {
-                                "id": referee.get("domareid"),
-                                "name": referee.get("personnamn"),
-                                "role": referee.get("domarrollnamn"),
-                                "email": referee.get("epostadress"),
-                                "phone": referee.get("mobiltelefon"),
-                            }
-                        )
-
-                # Add referee details to current match
-                if "domaruppdraglista" in curr_match:
-                    for referee in curr_match["domaruppdraglista"]:
-                        change_record["current"]["referees"].append(
-                            {
-                                "id": referee.get("domareid"),
-                                "name": referee.get("personnamn"),
-                                "role": referee.get("domarrollnamn"),
-                                "email": referee.get("epostadress"),
-                                "phone": referee.get("mobiltelefon"),
-                            }
-                        )
-
-                changed_matches.append(change_record)
+            changed_matches.append(change_record)
 
         # Prepare the changes summary
         changes = {
@@ -444,8 +880,10 @@ class MatchListChangeDetector:
 
         if has_changes:
             logger.info(
-                f"Changes detected: {len(new_match_ids)} new, "
-                f"{len(removed_match_ids)} removed, {len(changed_matches)} changed"
+                "Changes detected: %d new, %d removed, %d changed",
+                len(new_match_ids),
+                len(removed_match_ids),
+                len(changed_matches),
             )
         else:
             logger.info("No changes detected in match list")
@@ -463,54 +901,86 @@ class MatchListChangeDetector:
 
             compose_file_path = Path(DOCKER_COMPOSE_FILE)
             if not compose_file_path.is_file():
-                logger.error(f"Docker compose file not found: {compose_file_path}")
-                return False
-
-            # Find docker-compose executable
-            docker_compose_path = get_executable_path("docker-compose")
-            if not docker_compose_path:
-                logger.error("docker-compose executable not found in PATH")
+                logger.error("Docker compose file not found: %s", compose_file_path)
                 return False
 
-            # Save changes to a file that can be read by the docker-compose services
-            changes_file_path = validate_file_path("match_changes.json", create_dir=True)
-            if not changes_file_path:
-                logger.error("Invalid changes file path")
+            # Find docker compose
+            docker_compose_command = get_docker_compose_command()
+            if not docker_compose_command:
+                logger.error("Neither docker compose nor docker-compose found in PATH")
                 return False
 
-            with open(changes_file_path, "w") as f:
-                # noinspection PyTypeChecker
-                json.dump(changes, f, indent=2)
-
-            # Run docker-compose up with a timeout
-            logger.info(f"Triggering docker-compose with file: {compose_file_path}")
+            # Small change sets can be handed over in the environment instead of a file
+            env = None
+            payload = None
+            if MATCH_CHANGES_IN_ENV:
+                payload = json_utils.dumps(changes)
+                if len(payload) <= MATCH_CHANGES_ENV_MAX_BYTES:
+                    env = {**os.environ, "MATCH_CHANGES": payload.decode("utf-8")}
+
+            if env is None:
+                # Save changes to a file that can be read by the docker-compose services
+                changes_file_path = validate_file_path("match_changes.json", create_dir=True)
+                if not changes_file_path:
+                    logger.error("Invalid changes file path")
+                    return False
+
+                # Compact output, the file is parsed by the downstream services; serialized
+                # per record so the whole document is never held in memory at once
+                write_file_atomic(
+                    changes_file_path,
+                    payload if payload is not None else _iter_changes_json(changes),
+                )
+            else:
+                # Remove the file an earlier run may have left, so nobody reads stale changes
+                changes_file_path = validate_file_path("match_changes.json")
+                if changes_file_path:
+                    changes_file_path.unlink(missing_ok=True)
+
+            # Start docker-compose up without waiting for the orchestrator to finish
+            logger.info("Triggering docker-compose with file: %s", compose_file_path)
+            # Output goes to temporary files rather than pipes: docker-compose may outlive this
+            # process (oneshot mode exits right after the trigger), and writing to a pipe
+            # nobody reads any more would kill it. stdout is only logged at debug level.
+            stdout = tempfile.TemporaryFile() if logger.isEnabledFor(logging.DEBUG) else None
+            stderr = tempfile.TemporaryFile()
             try:
                 # We're using absolute paths and validating all inputs before this call
-                result = subprocess.run(  # nosec B603
-                    [docker_compose_path, "-f", str(compose_file_path.absolute()), "up", "-d"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,  # 30 second timeout
-                    check=False,  # We'll handle the return code ourselves
+                process = subprocess.Popen(  # nosec B603
+                    [*docker_compose_command, "-f", str(compose_file_path.absolute()), "up", "-d"],
+                    stdout=stdout if stdout is not None else subprocess.DEVNULL,
+                    stderr=stderr,
+                    env=env,
+                    start_new_session=True,
                 )
+                # Only wait long enough to catch commands that fail straight away
+                process.wait(timeout=DOCKER_COMPOSE_CHECK_SECONDS)
             except subprocess.TimeoutExpired:
-                logger.warning("docker-compose command timed out after 30 seconds")
-                logger.warning("This is normal if the orchestrator is starting many services")
-                logger.warning(
+                logger.info(
                     "The orchestrator has been triggered, but we're not waiting for it to complete"
                 )
+                # Log the outcome if this process is still around when docker-compose ends
+                threading.Thread(
+                    target=_wait_for_docker_compose, args=(process, stdout, stderr), daemon=True
+                ).start()
                 return True
-
-            if result.returncode == 0:
+            except Exception:
+                for output in (stdout, stderr):
+                    if output is not None:
+                        output.close()
+                raise
+
+            stdout_text, stderr_text = _read_output(stdout), _read_output(stderr)
+            if process.returncode == 0:
                 logger.info("Successfully triggered docker-compose")
-                logger.debug(f"docker-compose output: {result.stdout}")
+                logger.debug("docker-compose output: %s", stdout_text)
                 return True
             else:
-                logger.error(f"Error triggering docker-compose: {result.stderr}")
+                logger.error("Error triggering docker-compose: %s", stderr_text)
                 return False
 
         except Exception as e:
-            logger.error(f"Error triggering docker-compose: {e}")
+            logger.error("Error triggering docker-compose: %s", e)
             return False
 
     def run(self) -> bool:
@@ -519,18 +989,20 @@ class MatchListChangeDetector:
         metrics.record_run()
 
         try:
-            # Load previous matches
-            self.load_previous_matches()
+            # Load previous matches from disk while the current matches are fetched
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                load_future = executor.submit(self.load_previous_matches)
+                fetched = self.fetch_current_matches()
+                load_future.result()
 
-            # Fetch current matches
-            if not self.fetch_current_matches():
+            if not fetched:
                 logger.error("Failed to fetch current matches, aborting")
                 metrics.record_fetch_failure()
                 metrics.record_error()
                 return False
 
             # Record match count
-            metrics.record_matches(len(self.current_matches))
+            metrics.record_matches(len(self.current_matches_dict))
 
             # Detect changes
             has_changes, changes = self.detect_changes()
@@ -547,21 +1019,26 @@ class MatchListChangeDetector:
             if has_changes:
                 logger.info("Changes detected, triggering docker-compose")
                 metrics.record_orchestrator_trigger()
-                if not self.trigger_docker_compose(changes):
-                    metrics.record_orchestrator_failure()
-
-            # Save current matches for next comparison
-            self.save_current_matches()
+                # Saving does not depend on the trigger result, so write the file
+                # while waiting for docker-compose
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    save_future = executor.submit(self.save_current_matches)
+                    if not self.trigger_docker_compose(changes):
+                        metrics.record_orchestrator_failure()
+                    save_future.result()
+            else:
+                # Save current matches for next comparison
+                self.save_current_matches()
 
             # Record processing time
             processing_time = time.time() - start_time
             metrics.record_processing_time(processing_time)
-            logger.info(f"Change detection completed in {processing_time: .2f} seconds")
+            logger.info("Change detection completed in %.2f seconds", processing_time)
 
             return True
 
         except Exception as e:
-            logger.error(f"Error in change detection process: {e}")
+            logger.error("Error in change detection process: %s", e)
             metrics.record_error()
             return False
 
@@ -581,8 +1058,36 @@ def mask_sensitive_data(data: str) -> str:
     return "*" * 8  # Return fixed-length mask regardless of input length
 
 
-def main() -> bool:
-    """Run the match list change detection process."""
+def start_health_server() -> HealthServer:
+    """Start the health server, with HTTPS if configured.
+
+    Returns:
+        The running health server
+
+    """
+    use_https = config.get("USE_HTTPS", False)
+    health_server = HealthServer(
+        port=config.get("HEALTH_SERVER_PORT", 8000),
+        use_https=use_https,
+        cert_file=config.get("SSL_CERT_FILE") if use_https else None,
+        key_file=config.get("SSL_KEY_FILE") if use_https else None,
+    )
+    health_server.start()
+    return health_server
+
+
+def main(detector: Optional[MatchListChangeDetector] = None) -> bool:
+    """Run the match list change detection process.
+
+    Args:
+        detector: Detector to reuse between runs, so its API client keeps its cached
+            responses and pooled connections; the caller closes its API client. A new one
+            is created, and its API client closed after the run, when omitted
+
+    Returns:
+        True if the run succeeded, False otherwise
+
+    """
     # Check for required configuration
     username = config.get("FOGIS_USERNAME")
     password = config.get("FOGIS_PASSWORD")
@@ -592,12 +1097,18 @@ def main() -> bool:
         return False
 
     # Log username only, never log password even if masked
-    logger.info(f"Using FOGIS account: {username}")
+    logger.info("Using FOGIS account: %s", username)
     logger.debug("Password provided: [REDACTED]")
 
     # Create and run the detector
-    detector = MatchListChangeDetector(username, password)
-    success = detector.run()
+    if detector is None:
+        detector = MatchListChangeDetector(username, password)
+        try:
+            success = detector.run()
+        finally:
+            detector.api_client.close()
+    else:
+        success = detector.run()
 
     if success:
         logger.info("Match list change detection completed successfully")
@@ -608,4 +1119,6 @@ def main() -> bool:
 
 
 if __name__ == "__main__":
+    metrics.start_server()
+    start_health_server()
     main()
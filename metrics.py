@@ -7,32 +7,97 @@ Provides classes and functions to record and expose metrics.
 
 import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, cast
+from wsgiref.simple_server import WSGIRequestHandler, make_server
 
-from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
 
+from config import get_config
 
-# Define StartResponse type for WSGI
-class StartResponse(Protocol):
-    """Protocol for WSGI start_response callable."""
+# Re-exported for backwards compatibility; the health endpoint lives in health_server
+from health_server import StartResponse, ThreadingWSGIServer, health_check_handler  # noqa: F401
 
-    def __call__(
-        self, status: str, headers: List[Tuple[str, str]], exc_info: Optional[Any] = None
-    ) -> None:
-        """Call the start_response function."""
-        ...
+
+class CachedMetricsApp:
+    """WSGI app serving the Prometheus exposition, rendered at most once per TTL."""
+
+    registry: CollectorRegistry
+    ttl: float
+
+    def __init__(self, registry: CollectorRegistry = REGISTRY, ttl: float = 2.0) -> None:
+        """
+        Initialize the app.
+
+        Args:
+            registry: Registry to expose
+            ttl: Seconds a rendered response is reused
+        """
+        self.registry = registry
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._body = b""
+        self._expires_at = 0.0
+
+    def render(self) -> bytes:
+        """
+        Get the exposition, rendering it again only when the cached one has expired.
+
+        Returns:
+            Metrics in the Prometheus text format
+        """
+        # Scrapes arriving while the registry is rendered wait for that result
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._expires_at:
+                self._body = generate_latest(self.registry)
+                self._expires_at = now + self.ttl
+            return self._body
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
+        """
+        Handle a metrics request.
+
+        Args:
+            environ: WSGI environment
+            start_response: WSGI start_response function
+
+        Returns:
+            Response body
+        """
+        body = self.render()
+        start_response(
+            "200 OK",
+            [("Content-Type", CONTENT_TYPE_LATEST), ("Content-Length", str(len(body)))],
+        )
+        return (body,)
+
+
+class _SilentHandler(WSGIRequestHandler):
+    """Request handler that does not log every scrape to stderr."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Discard the request log line."""
 
 
 # Define metrics
 class Metrics:
     """Prometheus metrics for the Match List Change Detector."""
 
-    def __init__(self, port: int = 8000):
+    def __init__(self, port: int = 8000, cache_ttl: float = 2.0):
         """
         Initialize metrics.
 
         Args:
             port: Port to expose metrics on
+            cache_ttl: Seconds a rendered /metrics response is reused
         """
         # Counters
         self.matches_total = Counter(
@@ -44,6 +109,10 @@ class Metrics:
             "Total number of changes detected",
             ["type"],  # new, removed, changed
         )
+        # Bound once, so recording changes skips the label lookup
+        self._changes_new = self.changes_total.labels(type="new")
+        self._changes_removed = self.changes_total.labels(type="removed")
+        self._changes_changed = self.changes_total.labels(type="changed")
 
         self.errors_total = Counter(
             "match_list_change_detector_errors_total", "Total number of errors"
@@ -85,14 +154,25 @@ class Metrics:
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
         )
 
-        # Start metrics server in a separate thread
-        self.server_thread = threading.Thread(target=self._start_server, args=(port,))
-        self.server_thread.daemon = True
-        self.server_thread.start()
+        # Repeated scrapes within the TTL share one rendering of the registry
+        self.app = CachedMetricsApp(ttl=cache_ttl)
+
+        # The server is started by the entry points, so importing this module opens no port
+        self.port = port
+        self.server_thread: Optional[threading.Thread] = None
 
         # Set up as running
         self.up.set(1)
 
+    def start_server(self) -> None:
+        """Start the metrics server in a separate thread, unless it is already running."""
+        if self.server_thread is not None:
+            return
+
+        self.server_thread = threading.Thread(target=self._start_server, args=(self.port,))
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
     def _start_server(self, port: int) -> None:
         """
         Start the metrics server.
@@ -100,7 +180,14 @@ class Metrics:
         Args:
             port: Port to expose metrics on
         """
-        start_http_server(port)
+        server = make_server(
+            "",
+            port,
+            cast(Callable[[Dict[str, Any], Any], Iterable[bytes]], self.app),
+            server_class=ThreadingWSGIServer,
+            handler_class=_SilentHandler,
+        )
+        server.serve_forever()
 
     def record_matches(self, count: int) -> None:
         """
@@ -120,9 +207,12 @@ class Metrics:
             removed: Number of removed matches
             changed: Number of changed matches
         """
-        self.changes_total.labels(type="new").inc(new)
-        self.changes_total.labels(type="removed").inc(removed)
-        self.changes_total.labels(type="changed").inc(changed)
+        if new:
+            self._changes_new.inc(new)
+        if removed:
+            self._changes_removed.inc(removed)
+        if changed:
+            self._changes_changed.inc(changed)
 
     def record_error(self) -> None:
         """Record an error."""
@@ -166,7 +256,10 @@ class Metrics:
 class ApiRequestTimer:
     """Context manager for timing API requests."""
 
+    __slots__ = ("histogram", "_observe", "start")
+
     histogram: Histogram
+    _observe: Callable[[float], None]
     start: float
 
     def __init__(self, histogram: Histogram) -> None:
@@ -177,10 +270,12 @@ class ApiRequestTimer:
             histogram: Prometheus histogram to record time in
         """
         self.histogram = histogram
+        # Bound once, since every API request goes through a timer
+        self._observe = histogram.observe
 
     def __enter__(self) -> "ApiRequestTimer":
         """Start the timer."""
-        self.start = time.time()
+        self.start = time.perf_counter()
         return self
 
     def __exit__(self, exc_type: Optional[type], exc_val: Optional[Exception], exc_tb: Any) -> None:
@@ -192,26 +287,11 @@ class ApiRequestTimer:
             exc_val: Exception value
             exc_tb: Exception traceback
         """
-        self.histogram.observe(time.time() - self.start)
+        self._observe(time.perf_counter() - self.start)
 
 
 # Create a global metrics instance
-metrics = Metrics()
-
-
-# Health check endpoint handler
-def health_check_handler(environ: Dict[str, Any], start_response: StartResponse) -> Iterable[bytes]:
-    """
-    Handle health check requests.
-
-    Args:
-        environ: WSGI environment
-        start_response: WSGI start_response function
-
-    Returns:
-        Response body
-    """
-    status = "200 OK"
-    headers = [("Content-type", "application/json")]
-    start_response(status, headers)
-    return [b'{"status":"ok"}']
+metrics = Metrics(
+    port=int(get_config().get("METRICS_SERVER_PORT", 8001)),
+    cache_ttl=get_config().get("METRICS_CACHE_TTL", 2.0),
+)
@@ -15,25 +15,66 @@ import signal
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from types import FrameType
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import uvicorn
 from croniter import croniter
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 # Import existing modules
+import json_utils
 from config import get_config
 from logging_config import get_logger
 
+if TYPE_CHECKING:
+    from match_list_change_detector import MatchListChangeDetector
+
 logger = get_logger("persistent_service")
 
+# Longest the scheduler sleeps before checking the clock again
+MAX_SCHEDULER_SLEEP_SECONDS = 3600
+
+
+class _FastJSONResponse(JSONResponse):
+    """JSON response serialized with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the response content."""
+        return json_utils.dumps(content)
+
 
 class PersistentMatchListChangeDetectorService:
     """Persistent service implementation for match list change detection."""
 
+    __slots__ = (
+        "config",
+        "run_mode",
+        "cron_schedule",
+        "health_server_port",
+        "health_server_host",
+        "_fogis_username",
+        "_fogis_password_set",
+        "running",
+        "_shutdown_event",
+        "last_execution",
+        "next_execution",
+        "execution_count",
+        "start_time",
+        "_detect_executor",
+        "_detector",
+        "_trigger_semaphore",
+        "app",
+        "server_thread",
+        "_server",
+        "_cron_lock",
+        "_cron",
+    )
+
     def __init__(self) -> None:
         """Initialize the persistent service application."""
         # Get configuration
@@ -44,18 +85,33 @@ class PersistentMatchListChangeDetectorService:
         self.cron_schedule = self.config.get("CRON_SCHEDULE", "0 * * * *")
         self.health_server_port = int(self.config.get("HEALTH_SERVER_PORT", "8000"))
         self.health_server_host = self.config.get("HEALTH_SERVER_HOST", "127.0.0.1")  # nosec B104
+        # Reported by /status; read once since the configuration does not change at runtime
+        self._fogis_username = self.config.get("FOGIS_USERNAME", "NOT_SET")
+        self._fogis_password_set = bool(self.config.get("FOGIS_PASSWORD"))
 
         # Service state
         self.running = True
+        # Set on shutdown to wake the scheduler loop
+        self._shutdown_event = threading.Event()
         self.last_execution: Optional[datetime] = None
         self.next_execution: Optional[datetime] = None
         self.execution_count = 0
-        self.start_time = time.time()
+        # Monotonic, only used to report uptime
+        self.start_time = time.monotonic()
+
+        # Scheduled and manual runs share one worker, so detections never overlap
+        self._detect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detect")
+        # Kept between runs so the API client's response and health caches carry over
+        self._detector: Optional["MatchListChangeDetector"] = None
+        # Limits /trigger to one request at a time; created on first use in the server's loop
+        self._trigger_semaphore: Optional[asyncio.Semaphore] = None
 
         # Initialize HTTP server
         self.app = self._create_fastapi_app()
         self.server_thread: Optional[threading.Thread] = None
         self._server: Optional[uvicorn.Server] = None
+        # Scheduled and manual runs both move the shared cron iterator
+        self._cron_lock = threading.Lock()
 
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -67,8 +123,9 @@ class PersistentMatchListChangeDetectorService:
     def _validate_cron_schedule(self) -> None:
         """Validate the cron schedule format."""
         try:
-            cron = croniter(self.cron_schedule, datetime.now())
-            self.next_execution = cron.get_next(datetime)
+            # Parsed once and reused to compute every later execution time
+            self._cron: croniter = croniter(self.cron_schedule, datetime.now())
+            self.next_execution = self._cron.get_next(datetime)
             logger.info(
                 f"Cron schedule '{self.cron_schedule}' is valid. "
                 f"Next execution: {self.next_execution}"
@@ -83,10 +140,11 @@ class PersistentMatchListChangeDetectorService:
             title="Match List Change Detector",
             description="Persistent service for detecting changes in FOGIS match lists",
             version="1.0.0",
+            default_response_class=_FastJSONResponse,
         )
 
         @app.get("/health")
-        async def health_check() -> Dict[str, Any]:
+        async def health_check() -> Response:
             """Health check endpoint."""
             status = "healthy" if self.running else "unhealthy"
 
@@ -98,12 +156,12 @@ class PersistentMatchListChangeDetectorService:
                 "last_execution": self.last_execution.isoformat() if self.last_execution else None,
                 "next_execution": self.next_execution.isoformat() if self.next_execution else None,
                 "execution_count": self.execution_count,
-                "uptime_seconds": time.time() - self.start_time,
+                "uptime_seconds": time.monotonic() - self.start_time,
                 "timestamp": datetime.now().isoformat(),
             }
 
             status_code = 200 if status == "healthy" else 503
-            return JSONResponse(status_code=status_code, content=health_data)
+            return _FastJSONResponse(status_code=status_code, content=health_data)
 
         @app.post("/trigger")
         async def manual_trigger() -> Dict[str, str]:
@@ -111,14 +169,26 @@ class PersistentMatchListChangeDetectorService:
             if not self.running:
                 raise HTTPException(status_code=503, detail="Service is not running")
 
+            if self._trigger_semaphore is None:
+                self._trigger_semaphore = asyncio.Semaphore(1)
+
             try:
-                logger.info("Manual trigger received, executing change detection...")
-                await self._execute_change_detection()
+                async with self._trigger_semaphore:
+                    logger.info("Manual trigger received, executing change detection...")
+                    await self._execute_change_detection()
                 return {"status": "success", "message": "Change detection executed successfully"}
             except Exception as e:
                 logger.error(f"Manual trigger failed: {e}")
                 raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
 
+        @app.get("/metrics")
+        async def prometheus_metrics() -> Response:
+            """Prometheus metrics endpoint, served by the same server as the health checks."""
+            # Imported here so the metrics are only registered once they are needed
+            from metrics import metrics
+
+            return Response(content=metrics.app.render(), media_type=CONTENT_TYPE_LATEST)
+
         @app.get("/status")
         async def service_status() -> Dict[str, Any]:
             """Detailed service status endpoint."""
@@ -130,12 +200,12 @@ class PersistentMatchListChangeDetectorService:
                 "last_execution": self.last_execution.isoformat() if self.last_execution else None,
                 "next_execution": self.next_execution.isoformat() if self.next_execution else None,
                 "execution_count": self.execution_count,
-                "uptime_seconds": time.time() - self.start_time,
+                "uptime_seconds": time.monotonic() - self.start_time,
                 "configuration": {
                     "health_server_port": self.health_server_port,
                     "health_server_host": self.health_server_host,
-                    "fogis_username": self.config.get("FOGIS_USERNAME", "NOT_SET"),
-                    "fogis_password_set": bool(self.config.get("FOGIS_PASSWORD")),
+                    "fogis_username": self._fogis_username,
+                    "fogis_password_set": self._fogis_password_set,
                 },
             }
 
@@ -152,10 +222,18 @@ class PersistentMatchListChangeDetectorService:
         """Shutdown the application gracefully."""
         logger.info("Shutting down match list change detector...")
         self.running = False
+        self._shutdown_event.set()
 
         if self._server:
             self._server.should_exit = True
 
+        # Let a running detection finish in the background, but start no new ones
+        self._detect_executor.shutdown(wait=False)
+
+        # The detector keeps its HTTP session open between runs; release it now
+        if self._detector is not None:
+            self._detector.api_client.close()
+
         if self.server_thread and self.server_thread.is_alive():
             self.server_thread.join(timeout=5)
             logger.info("HTTP server stopped")
@@ -168,18 +246,18 @@ class PersistentMatchListChangeDetectorService:
 
             logger.info(f"Starting change detection cycle #{self.execution_count}")
 
-            # Import and run the main detection logic
-            from match_list_change_detector import main as run_detection
-
-            # Run the change detection in a thread pool to avoid blocking
-            result = await asyncio.get_event_loop().run_in_executor(None, run_detection)
+            # Run the change detection in its own worker thread to avoid blocking
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._detect_executor, self._run_detection
+            )
 
             logger.info(f"Change detection cycle #{self.execution_count} completed successfully")
 
             # Update next execution time if running in service mode
             if self.run_mode == "service":
-                cron = croniter(self.cron_schedule, self.last_execution)
-                self.next_execution = cron.get_next(datetime)
+                with self._cron_lock:
+                    self._cron.set_current(self.last_execution)
+                    self.next_execution = self._cron.get_next(datetime)
                 logger.info(f"Next scheduled execution: {self.next_execution}")
 
             return result
@@ -189,6 +267,20 @@ class PersistentMatchListChangeDetectorService:
             logger.exception("Change detection stack trace:")
             raise
 
+    def _run_detection(self) -> bool:
+        """Run one detection cycle, reusing the detector from earlier cycles."""
+        # Import the main detection logic
+        from match_list_change_detector import MatchListChangeDetector
+        from match_list_change_detector import main as run_detection
+
+        # Only ever called on the single detection worker, so no lock is needed
+        if self._detector is None:
+            username = self.config.get("FOGIS_USERNAME")
+            password = self.config.get("FOGIS_PASSWORD")
+            if username and password:
+                self._detector = MatchListChangeDetector(username, password)
+        return run_detection(self._detector)
+
     def _start_http_server(self) -> None:
         """Start the HTTP server in a separate thread."""
 
@@ -239,14 +331,19 @@ class PersistentMatchListChangeDetectorService:
                     logger.info("Scheduled execution time reached, running change detection...")
                     asyncio.run(self._execute_change_detection())
 
-                # Sleep for 1 second and check again
-                time.sleep(1)
+                # Sleep until the next execution, waking early on shutdown. Capped at an
+                # hour so wall clock changes (DST, NTP) are noticed in time.
+                if self.next_execution:
+                    delay = (self.next_execution - datetime.now()).total_seconds()
+                else:
+                    delay = MAX_SCHEDULER_SLEEP_SECONDS
+                self._shutdown_event.wait(min(max(delay, 0.0), MAX_SCHEDULER_SLEEP_SECONDS))
 
             except Exception as e:
                 logger.error(f"Error in service loop: {e}")
                 logger.exception("Service loop stack trace:")
                 # Continue running even if one cycle fails
-                time.sleep(30)  # Wait 30 seconds before retrying
+                self._shutdown_event.wait(30)  # Wait 30 seconds before retrying
 
         logger.info("Service mode stopped")
 
@@ -275,7 +372,11 @@ def main() -> None:
     else:
         # Run original oneshot mode
         from match_list_change_detector import main as original_main
+        from match_list_change_detector import start_health_server
+        from metrics import metrics
 
+        metrics.start_server()
+        start_health_server()
         original_main()
 
 
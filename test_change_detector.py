@@ -66,12 +66,13 @@ logger.info("Saved current matches as previous matches")
 
 # Modify one match to simulate a change
 if detector.current_matches:
-    # Make a deep copy of the current matches
-    modified_matches = json.loads(json.dumps(detector.current_matches))
+    # The property already returns a new list; only the first match is replaced, so the
+    # others can be shared
+    modified_matches = detector.current_matches
 
-    # Modify the first match
+    # Modify a copy of the first match, leaving the original untouched
     if modified_matches:
-        modified_matches[0]["avsparkstid"] = "19:30"  # Change the match time
+        modified_matches[0] = {**modified_matches[0], "avsparkstid": "19:30"}  # Change the time
         logger.info(f"Modified match time for match ID: {modified_matches[0]['matchid']}")
 
     # Save the previous matches
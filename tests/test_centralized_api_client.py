@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the centralized API client.
+
+Verifies that the client talks to the centralized service correctly.
+"""
+
+import io
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from centralized_api_client import (
+    BatchingFetcher,
+    CentralizedFogisApiClient,
+    TokenBucket,
+    _decode_matches,
+)
+
+
+def make_response(body: bytes = b'[{"matchid": 1}]', status_code: int = 200, **headers):
+    """Build a mock response carrying a JSON body."""
+    headers.setdefault("Content-Length", str(len(body)))
+    return MagicMock(status_code=status_code, headers=headers, content=body)
+
+
+class TestCentralizedFogisApiClient(unittest.TestCase):
+    """Test cases for the CentralizedFogisApiClient class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = CentralizedFogisApiClient(api_client_url="http://api-client:8080")
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.client.close()
+
+    def test_session_reused_between_requests(self):
+        """Test that login and fetch share a single HTTP session."""
+        session = self.client._get_session()
+        response = make_response()
+
+        with patch.object(session, "head", return_value=response) as mock_head, patch.object(
+            session, "get", return_value=response
+        ) as mock_get:
+            self.assertTrue(self.client.login())
+            result = self.client.fetch_matches_list_json()
+
+        mock_head.assert_called_once()
+        mock_get.assert_called_once()
+        self.assertIs(self.client._get_session(), session)
+        self.assertEqual(result["total"], 1)
+
+    def test_login_falls_back_to_get_when_head_not_allowed(self):
+        """Test that a 405 on HEAD retries the health check with GET and caches the result."""
+        session = self.client._get_session()
+
+        with patch.object(
+            session, "head", return_value=make_response(b"", status_code=405)
+        ) as mock_head, patch.object(session, "get", return_value=make_response()) as mock_get:
+            self.assertTrue(self.client.login())
+            self.assertTrue(self.client.login())
+
+        mock_head.assert_called_once()
+        mock_get.assert_called_once()
+
+    def test_fetch_uses_cache_within_ttl(self):
+        """Test that a fresh cached response is returned without a request."""
+        response = make_response(ETag='"v1"')
+
+        with patch.object(self.client._get_session(), "get", return_value=response) as mock_get:
+            first = self.client.fetch_matches_list_json({"datumFran": "2025-01-01"})
+            second = self.client.fetch_matches_list_json({"datumFran": "2025-01-01"})
+
+        mock_get.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_fetch_revalidates_with_etag_after_ttl(self):
+        """Test that an expired entry is revalidated and reused on 304."""
+        self.client.cache_ttl = 0
+        ok_response = make_response(ETag='"v1"')
+        not_modified = make_response(b"", status_code=304)
+
+        with patch.object(
+            self.client._get_session(), "get", side_effect=[ok_response, not_modified]
+        ) as mock_get:
+            first = self.client.fetch_matches_list_json()
+            second = self.client.fetch_matches_list_json()
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(first, second)
+
+    def test_fetch_streams_large_bodies(self):
+        """Test that bodies without a small Content-Length are parsed from the raw stream."""
+        matches = [{"matchid": i, "speldatum": "2025-04-26"} for i in range(100)]
+        response = MagicMock(status_code=200, headers={})
+        response.raw = io.BytesIO(json.dumps(matches).encode())
+
+        with patch.object(self.client._get_session(), "get", return_value=response):
+            result = self.client.fetch_matches_list_json()
+
+        self.assertEqual(result["matches"], matches)
+
+    def test_large_object_body_decoded_like_small_one(self):
+        """Test that an object-shaped body decodes the same whether it is streamed or not."""
+        body = json.dumps({"matches": [{"matchid": i} for i in range(100)]}).encode()
+        small = make_response(body)
+        large = MagicMock(status_code=200, headers={})
+        large.raw = io.BytesIO(body)
+
+        self.assertEqual(_decode_matches(large), _decode_matches(small))
+        self.assertEqual(len(_decode_matches(small)["matches"]), 100)
+
+    def test_close_releases_session(self):
+        """Test that closing the client drops the session and a new one is created on demand."""
+        session = self.client._get_session()
+        self.client.close()
+
+        self.assertIsNone(self.client._session)
+        self.assertIsNot(self.client._get_session(), session)
+
+    def test_close_keeps_cached_responses(self):
+        """Test that a closed client still answers from its cache and batches again."""
+        client = CentralizedFogisApiClient(
+            api_client_url="http://api-client:8080", batch_window=0.01
+        )
+        with patch.object(client._get_session(), "get", return_value=make_response()) as mock_get:
+            first = client.fetch_matches_list_json()
+        client.close()
+
+        with patch.object(client._get_session(), "get") as mock_get_after_close:
+            second = client.fetch_matches_list_json()
+        client.close()
+
+        mock_get.assert_called_once()
+        mock_get_after_close.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIsNone(client._batcher)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the TokenBucket class."""
+
+    @patch("centralized_api_client.time.sleep")
+    def test_burst_then_wait(self, mock_sleep):
+        """Test that a full bucket allows a burst and then waits for a refill."""
+        bucket = TokenBucket(rate=1.0, capacity=2)
+
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        waited = bucket.acquire()
+
+        self.assertGreater(waited, 0.9)
+        mock_sleep.assert_called_once_with(waited)
+
+    @patch("centralized_api_client.time.sleep")
+    def test_zero_rate_disables_limit(self, mock_sleep):
+        """Test that a rate of 0, or below, never waits."""
+        for rate in (0.0, -1.0):
+            bucket = TokenBucket(rate=rate, capacity=rate)
+            for _ in range(3):
+                self.assertEqual(bucket.acquire(), 0.0)
+
+        mock_sleep.assert_not_called()
+
+
+class TestBatchingFetcher(unittest.TestCase):
+    """Test cases for the BatchingFetcher class."""
+
+    def test_identical_filters_share_one_request(self):
+        """Test that concurrent calls with the same filter result in one fetch."""
+        fetch = MagicMock(return_value={"matches": [], "total": 0, "status": "success"})
+        fetcher = BatchingFetcher(fetch, window=0.05)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(fetcher.fetch({"datumFran": "x"})))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fetcher.close()
+
+        fetch.assert_called_once_with({"datumFran": "x"})
+        self.assertEqual(len(results), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the configuration module.
+
+Verifies that configuration values are loaded from the environment correctly.
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from config import Config, get_config
+
+
+class TestConfig(unittest.TestCase):
+    """Test cases for the Config class."""
+
+    @patch.dict(
+        os.environ,
+        {"DAYS_BACK": "14", "USE_HTTPS": "Yes", "LOG_LEVEL": "DEBUG"},
+    )
+    def test_env_values_converted_to_default_types(self):
+        """Test that environment values are converted to the type of their default."""
+        config = Config()
+
+        self.assertEqual(config.get("DAYS_BACK"), 14)
+        self.assertIs(config.get("USE_HTTPS"), True)
+        self.assertEqual(config.get("LOG_LEVEL"), "DEBUG")
+
+    @patch.dict(os.environ, {"MLCD_DAYS_AHEAD": "30", "DAYS_AHEAD": "10"})
+    def test_env_prefix(self):
+        """Test that only prefixed environment variables are used when a prefix is set."""
+        config = Config(env_prefix="MLCD_")
+
+        self.assertEqual(config.get("DAYS_AHEAD"), 30)
+
+    def test_as_dict_is_read_only(self):
+        """Test that as_dict returns a read-only view and as_mutable_dict a copy."""
+        config = Config()
+
+        with self.assertRaises(TypeError):
+            config.as_dict()["LOG_LEVEL"] = "DEBUG"
+
+        copy = config.as_mutable_dict()
+        copy["DAYS_BACK"] = -1
+        self.assertNotEqual(config.get("DAYS_BACK"), -1)
+
+    def test_get_config_caches_prefixed_instances(self):
+        """Test that get_config returns the same instance for the same prefix."""
+        self.assertIs(get_config(), get_config())
+        self.assertIs(get_config("MLCD_"), get_config("MLCD_"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the logging configuration module.
+
+Verifies that loggers are configured with the expected handlers and output.
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import logging_config
+from logging_config import (
+    BufferedRotatingFileHandler,
+    configure_logging,
+    get_log_level,
+    shutdown_logging,
+)
+
+
+class TestGetLogLevel(unittest.TestCase):
+    """Test cases for get_log_level."""
+
+    def test_known_and_unknown_levels(self):
+        """Test that level names map to logging levels and unknown names fall back to INFO."""
+        self.assertEqual(get_log_level("debug"), logging.DEBUG)
+        self.assertEqual(get_log_level("NOTSET"), logging.NOTSET)
+        self.assertEqual(get_log_level("verbose"), logging.INFO)
+
+
+class TestConfigureLogging(unittest.TestCase):
+    """Test cases for configure_logging."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutdown_logging()
+        logging.getLogger("test_logging_config").handlers = []
+        shutil.rmtree(self.log_dir)
+
+    def test_logger_uses_queue_handler(self):
+        """Test that the logger only enqueues records and the listener writes them."""
+        logger = configure_logging(
+            "test_logging_config", log_dir=self.log_dir, console_output=False
+        )
+
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+        logger.warning("queued %s", "message")
+        shutdown_logging()
+
+        with open(os.path.join(self.log_dir, "match_list_change_detector.log")) as f:
+            self.assertIn("queued message", f.read())
+
+    def test_shutdown_ignores_closed_streams(self):
+        """Test that shutdown does not fail when a handler's stream is already closed."""
+        configure_logging("test_logging_config", log_dir=self.log_dir, console_output=True)
+        # Same as a stream closed by another atexit hook before ours runs
+        for handler in logging_config._queue_listeners["test_logging_config"].handlers:
+            if isinstance(handler, logging.StreamHandler):
+                handler.stream = open(os.devnull, "w")
+                handler.stream.close()
+
+        shutdown_logging()
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    """Test cases for _DroppingQueueHandler."""
+
+    def test_full_queue_drops_records_quietly(self):
+        """Test that records are counted and dropped, not reported, when the queue is full."""
+        handler = logging_config._DroppingQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+
+        with patch.object(handler, "handleError") as mock_handle_error:
+            handler.handle(record)
+            handler.handle(record)
+
+        mock_handle_error.assert_not_called()
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 1)
+
+
+class TestBufferedRotatingFileHandler(unittest.TestCase):
+    """Test cases for BufferedRotatingFileHandler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.log_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.log_dir, "test.log")
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        shutil.rmtree(self.log_dir)
+
+    def test_buffers_until_flush_and_rotates(self):
+        """Test that records are buffered until flushed and the file rotates at maxBytes."""
+        handler = BufferedRotatingFileHandler(
+            self.log_path, maxBytes=100, backupCount=1, delay=True
+        )
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "x" * 40, None, None)
+
+        handler.emit(record)
+        self.assertEqual(os.path.getsize(self.log_path), 0)
+        handler.flush()
+        self.assertEqual(os.path.getsize(self.log_path), 41)
+
+        handler.emit(record)
+        handler.emit(record)
+        handler.close()
+
+        self.assertTrue(os.path.exists(self.log_path + ".1"))
+        self.assertEqual(os.path.getsize(self.log_path + ".1"), 82)
+        self.assertEqual(os.path.getsize(self.log_path), 41)
+
+    def test_rotates_by_encoded_size(self):
+        """Test that non-ASCII text counts towards maxBytes by its encoded size."""
+        handler = BufferedRotatingFileHandler(
+            self.log_path, maxBytes=100, backupCount=1, delay=True, encoding="utf-8"
+        )
+        # 30 characters but 60 bytes (plus the newline) in UTF-8
+        record = logging.LogRecord("test", logging.INFO, __file__, 1, "å" * 30, None, None)
+
+        handler.emit(record)
+        handler.emit(record)
+        handler.close()
+
+        self.assertEqual(os.path.getsize(self.log_path + ".1"), 61)
+        self.assertEqual(os.path.getsize(self.log_path), 61)
+
+
+if __name__ == "__main__":
+    unittest.main()
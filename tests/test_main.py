@@ -38,6 +38,7 @@ class TestMain(unittest.TestCase):
         self.assertTrue(result)
         mock_detector_class.assert_called_once_with("test_user", "test_pass")
         mock_detector.run.assert_called_once()
+        mock_detector.api_client.close.assert_called_once()
 
     @patch("match_list_change_detector.config.get")
     @patch("match_list_change_detector.MatchListChangeDetector")
@@ -59,6 +60,24 @@ class TestMain(unittest.TestCase):
         # Verify the result
         self.assertFalse(result)
 
+    @patch("match_list_change_detector.config.get")
+    @patch("match_list_change_detector.MatchListChangeDetector")
+    def test_main_reuses_given_detector(self, mock_detector_class, mock_config_get):
+        """Test that a detector passed in is run instead of creating a new one."""
+        mock_config_get.side_effect = lambda key, default=None: {
+            "FOGIS_USERNAME": "test_user",
+            "FOGIS_PASSWORD": "test_pass",
+        }.get(key, default)
+        detector = MagicMock()
+        detector.run.return_value = True
+
+        self.assertTrue(main(detector))
+
+        mock_detector_class.assert_not_called()
+        detector.run.assert_called_once()
+        # The caller keeps the detector, and its HTTP session, for the next run
+        detector.api_client.close.assert_not_called()
+
     @patch("match_list_change_detector.config.get")
     def test_main_missing_credentials(self, mock_config_get):
         """Test the main function with missing credentials."""
@@ -18,7 +18,13 @@ with patch("sys.modules", {"fogis_api_client": MagicMock()}):
     # Now import the module to test
     from pathlib import Path
 
-    from match_list_change_detector import PREVIOUS_MATCHES_FILE, MatchListChangeDetector
+    from match_list_change_detector import (
+        PREVIOUS_MATCHES_FILE,
+        MatchListChangeDetector,
+        _iter_changes_json,
+        get_docker_compose_command,
+        write_file_atomic,
+    )
 
 
 class TestMatchListChangeDetector(unittest.TestCase):
@@ -81,6 +87,16 @@ class TestMatchListChangeDetector(unittest.TestCase):
         self.assertEqual(len(self.detector.previous_matches), 1)
         self.assertEqual(self.detector.previous_matches[0]["matchid"], 6169105)
 
+    @patch("match_list_change_detector.STREAM_THRESHOLD_BYTES", 0)
+    def test_load_previous_matches_streams_large_files(self):
+        """Test that large files are parsed incrementally in both saved formats."""
+        for saved in ([self.sample_match], {"6169105": self.sample_match}):
+            with open(PREVIOUS_MATCHES_FILE, "w") as f:
+                json.dump(saved, f)
+
+            self.assertTrue(self.detector.load_previous_matches())
+            self.assertEqual(self.detector.previous_matches, [self.sample_match])
+
     def test_load_previous_matches_file_not_exists(self):
         """Test loading previous matches when the file doesn't exist."""
         # Make sure the file doesn't exist
@@ -110,17 +126,29 @@ class TestMatchListChangeDetector(unittest.TestCase):
         with open(PREVIOUS_MATCHES_FILE, "r") as f:
             saved_matches = json.load(f)
         self.assertEqual(len(saved_matches), 1)
-        self.assertEqual(saved_matches[0]["matchid"], 6169105)
+        self.assertEqual(saved_matches["6169105"]["matchid"], 6169105)
+
+    @patch.object(MatchListChangeDetector, "trigger_docker_compose", return_value=True)
+    def test_run_forgets_previous_matches_of_earlier_run(self, mock_trigger):
+        """Test that a reused detector does not compare against matches whose file is gone."""
+        self.api_client_mock.fetch_matches_list_json.return_value = {"matches": [self.sample_match]}
+        self.assertTrue(self.detector.run())
+        # The second run loads the matches saved by the first and finds nothing new
+        self.assertTrue(self.detector.run())
+        self.assertEqual(len(self.detector.previous_matches), 1)
+
+        os.remove(PREVIOUS_MATCHES_FILE)
+        self.assertTrue(self.detector.run())
+
+        self.assertEqual(self.detector.previous_matches, [])
+        self.assertEqual(self.detector.previous_digests, {})
+        self.assertEqual(mock_trigger.call_count, 2)
+        self.assertEqual(mock_trigger.call_args.args[0]["message"], "Initial match list fetch")
 
-    @patch("match_list_change_detector.MatchListFilter")
-    def test_fetch_current_matches_success(self, mock_match_list_filter):
+    def test_fetch_current_matches_success(self):
         """Test fetching current matches successfully."""
         # Set up the mock
-        mock_filter_instance = MagicMock()
-        mock_match_list_filter.return_value = mock_filter_instance
-        mock_filter_instance.start_date.return_value = mock_filter_instance
-        mock_filter_instance.end_date.return_value = mock_filter_instance
-        mock_filter_instance.fetch_filtered_matches.return_value = [self.sample_match]
+        self.api_client_mock.fetch_matches_list_json.return_value = {"matches": [self.sample_match]}
 
         # Fetch current matches
         result = self.detector.fetch_current_matches()
@@ -132,10 +160,12 @@ class TestMatchListChangeDetector(unittest.TestCase):
 
         # Verify the API client was used correctly
         self.api_client_mock.login.assert_called_once()
-        mock_filter_instance.fetch_filtered_matches.assert_called_once_with(self.api_client_mock)
+        filter_params = self.api_client_mock.fetch_matches_list_json.call_args.kwargs[
+            "filter_params"
+        ]
+        self.assertEqual(set(filter_params), {"datumFran", "datumTill"})
 
-    @patch("match_list_change_detector.MatchListFilter")
-    def test_fetch_current_matches_failure(self, mock_match_list_filter):
+    def test_fetch_current_matches_failure(self):
         """Test fetching current matches with a failure."""
         # Set up the mock to raise an exception
         self.api_client_mock.login.side_effect = Exception("Login failed")
@@ -147,6 +177,32 @@ class TestMatchListChangeDetector(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(len(self.detector.current_matches), 0)
 
+    def test_fetch_current_matches_missing_match_id(self):
+        """Test that a match without an ID fails the fetch instead of emptying the list."""
+        self.api_client_mock.fetch_matches_list_json.return_value = {
+            "matches": [self.sample_match, {"id": 2}]
+        }
+
+        self.assertFalse(self.detector.fetch_current_matches())
+
+    def test_fetch_current_matches_logs_in_once(self):
+        """Test that later fetches reuse the login until a fetch fails."""
+        self.api_client_mock.fetch_matches_list_json.return_value = [self.sample_match]
+
+        self.assertTrue(self.detector.fetch_current_matches())
+        self.assertTrue(self.detector.fetch_current_matches())
+        self.api_client_mock.login.assert_called_once()
+
+        # A failed fetch, reported in the response as the client does, forces a new login
+        self.api_client_mock.fetch_matches_list_json.side_effect = [
+            {"matches": [], "total": 0, "status": "error", "error": "401 Unauthorized"},
+            {"matches": [self.sample_match], "total": 1, "status": "success"},
+        ]
+        self.assertFalse(self.detector.fetch_current_matches())
+        self.assertFalse(self.detector.logged_in)
+        self.assertTrue(self.detector.fetch_current_matches())
+        self.assertEqual(self.api_client_mock.login.call_count, 2)
+
     def test_detect_changes_no_previous_matches(self):
         """Test detecting changes when there are no previous matches."""
         # Set up the detector
@@ -267,6 +323,96 @@ class TestMatchListChangeDetector(unittest.TestCase):
         self.assertTrue(has_changes)
         self.assertEqual(changes["changed_matches"], 1)
         self.assertTrue(changes["changed_match_details"][0]["changes"]["referees"])
+        self.assertEqual(
+            [referee["id"] for referee in changes["changed_match_details"][0]["referees_added"]],
+            [7700],
+        )
+        self.assertEqual(
+            [referee["id"] for referee in changes["changed_match_details"][0]["referees_removed"]],
+            [6600],
+        )
+
+    def test_detect_changes_reports_raw_status_values(self):
+        """Test that a status change between None and 0 is detected and reported as sent."""
+        previous_match = {**self.sample_match, "installd": None}
+        current_match = {**self.sample_match, "installd": 0}
+        self.detector.previous_matches = [previous_match]
+        self.detector.current_matches = [current_match]
+
+        has_changes, changes = self.detector.detect_changes()
+
+        self.assertTrue(has_changes)
+        details = changes["changed_match_details"][0]
+        self.assertIsNone(details["previous"]["status"]["cancelled"])
+        self.assertEqual(details["current"]["status"]["cancelled"], 0)
+
+    def test_detect_changes_after_load_uses_digests(self):
+        """Test that loaded matches are digested and only differing ones are compared."""
+        changed_match = self.sample_match.copy()
+        changed_match["matchid"] = 6169106
+        with open(PREVIOUS_MATCHES_FILE, "w") as f:
+            json.dump([self.sample_match, changed_match], f)
+        self.detector.load_previous_matches()
+
+        current_match = changed_match.copy()
+        current_match["avsparkstid"] = "20:00"
+        self.detector.current_matches = [self.sample_match.copy(), current_match]
+
+        has_changes, changes = self.detector.detect_changes()
+
+        self.assertEqual(len(self.detector.previous_digests), 2)
+        self.assertTrue(has_changes)
+        self.assertEqual(changes["changed_matches"], 1)
+        self.assertEqual(changes["changed_match_details"][0]["match_id"], 6169106)
+
+    def test_saved_digests_skip_comparison_on_next_run(self):
+        """Test that digests saved with the matches are reused and short-circuit detection."""
+        self.detector.current_matches = [self.sample_match]
+        self.detector.save_current_matches()
+
+        detector = MatchListChangeDetector("test_user", "test_pass")
+        detector.load_previous_matches()
+        detector.current_matches = [self.sample_match.copy()]
+
+        with patch("match_list_change_detector._match_signature") as mock_signature:
+            has_changes, changes = detector.detect_changes()
+
+        self.assertEqual(detector.previous_digests, self.detector.current_digests)
+        mock_signature.assert_not_called()
+        self.assertFalse(has_changes)
+        self.assertEqual(changes["changed_matches"], 0)
+
+    @patch("match_list_change_detector.STREAM_THRESHOLD_BYTES", 0)
+    def test_saved_digests_reused_when_streaming(self):
+        """Test that streamed previous matches are matched to their saved digests."""
+        self.detector.current_matches = [self.sample_match]
+        self.detector.save_current_matches()
+
+        detector = MatchListChangeDetector("test_user", "test_pass")
+        with patch("match_list_change_detector._match_digests") as mock_digests:
+            detector.load_previous_matches()
+
+        mock_digests.assert_not_called()
+        self.assertEqual(detector.previous_digests, self.detector.current_digests)
+
+    def test_stale_digests_ignored(self):
+        """Test that digests saved for a different matches file are not trusted."""
+        self.detector.current_matches = [self.sample_match]
+        self.detector.save_current_matches()
+
+        # The matches file changes but the digests file is left from the earlier save
+        changed_match = self.sample_match.copy()
+        changed_match["avsparkstid"] = "20:00"
+        write_file_atomic(Path(PREVIOUS_MATCHES_FILE), json.dumps([changed_match]).encode("utf-8"))
+
+        detector = MatchListChangeDetector("test_user", "test_pass")
+        detector.load_previous_matches()
+        detector.current_matches = [self.sample_match.copy()]
+
+        has_changes, changes = detector.detect_changes()
+
+        self.assertTrue(has_changes)
+        self.assertEqual(changes["changed_matches"], 1)
 
     def test_detect_changes_no_changes(self):
         """Test detecting no changes."""
@@ -283,16 +429,16 @@ class TestMatchListChangeDetector(unittest.TestCase):
         self.assertEqual(changes["removed_matches"], 0)
         self.assertEqual(changes["changed_matches"], 0)
 
-    @patch("match_list_change_detector.subprocess.run")
-    @patch("match_list_change_detector.get_executable_path")
+    @patch("match_list_change_detector.subprocess.Popen")
+    @patch("match_list_change_detector.get_docker_compose_command")
     @patch("match_list_change_detector.validate_file_path")
-    def test_trigger_docker_compose_success(self, mock_validate, mock_get_exec, mock_run):
+    def test_trigger_docker_compose_success(self, mock_validate, mock_get_exec, mock_popen):
         """Test triggering docker-compose successfully."""
         # Set up the mocks
         mock_process = MagicMock()
         mock_process.returncode = 0
-        mock_run.return_value = mock_process
-        mock_get_exec.return_value = "/usr/bin/docker-compose"
+        mock_popen.return_value = mock_process
+        mock_get_exec.return_value = ("/usr/bin/docker", "compose")
         mock_validate.return_value = Path("match_changes.json")
 
         # Create a changes dictionary
@@ -311,20 +457,54 @@ class TestMatchListChangeDetector(unittest.TestCase):
         # Verify the result
         self.assertTrue(result)
         mock_validate.assert_called()
-        mock_get_exec.assert_called_once_with("docker-compose")
-        mock_run.assert_called_once()
+        mock_get_exec.assert_called_once_with()
+        mock_popen.assert_called_once()
+        self.assertEqual(mock_popen.call_args.args[0][:3], ["/usr/bin/docker", "compose", "-f"])
+
+    @patch("match_list_change_detector.MATCH_CHANGES_IN_ENV", True)
+    @patch("match_list_change_detector.subprocess.Popen")
+    @patch("match_list_change_detector.get_docker_compose_command")
+    def test_trigger_docker_compose_passes_changes_in_env(self, mock_get_command, mock_popen):
+        """Test that small change sets are passed in the environment without a file."""
+        Path("docker-compose.yml").touch()
+        # Left by an earlier run that wrote the changes to the file
+        Path("match_changes.json").write_text('{"new_matches": 5}')
+        mock_get_command.return_value = ("/usr/bin/docker", "compose")
+        mock_popen.return_value = MagicMock(returncode=0)
+        changes = {"new_matches": 1, "new_match_details": [self.sample_match]}
+
+        with patch("match_list_change_detector.DOCKER_COMPOSE_FILE", "docker-compose.yml"):
+            result = self.detector.trigger_docker_compose(changes)
+
+        self.assertTrue(result)
+        self.assertFalse(os.path.exists("match_changes.json"))
+        env = mock_popen.call_args.kwargs["env"]
+        self.assertEqual(json.loads(env["MATCH_CHANGES"]), changes)
 
     @patch("match_list_change_detector.subprocess.run")
-    @patch("match_list_change_detector.get_executable_path")
+    @patch("match_list_change_detector.shutil.which")
+    def test_get_docker_compose_command(self, mock_which, mock_run):
+        """Test that the compose plugin is preferred and docker-compose is the fallback."""
+        mock_which.side_effect = {"docker": "/usr/bin/docker"}.get
+        mock_run.return_value = MagicMock(returncode=0)
+        get_docker_compose_command.cache_clear()
+        self.assertEqual(get_docker_compose_command(), ("/usr/bin/docker", "compose"))
+
+        mock_which.side_effect = {"docker-compose": "/usr/bin/docker-compose"}.get
+        get_docker_compose_command.cache_clear()
+        self.assertEqual(get_docker_compose_command(), ("/usr/bin/docker-compose",))
+        get_docker_compose_command.cache_clear()
+
+    @patch("match_list_change_detector.subprocess.Popen")
+    @patch("match_list_change_detector.get_docker_compose_command")
     @patch("match_list_change_detector.validate_file_path")
-    def test_trigger_docker_compose_failure(self, mock_validate, mock_get_exec, mock_run):
+    def test_trigger_docker_compose_failure(self, mock_validate, mock_get_exec, mock_popen):
         """Test triggering docker-compose with a failure."""
         # Set up the mocks
         mock_process = MagicMock()
         mock_process.returncode = 1
-        mock_process.stderr = "Error"
-        mock_run.return_value = mock_process
-        mock_get_exec.return_value = "/usr/bin/docker-compose"
+        mock_popen.return_value = mock_process
+        mock_get_exec.return_value = ("/usr/bin/docker", "compose")
         mock_validate.return_value = Path("match_changes.json")
 
         # Create a changes dictionary
@@ -343,14 +523,20 @@ class TestMatchListChangeDetector(unittest.TestCase):
         # Verify the result
         self.assertFalse(result)
 
-    @patch("match_list_change_detector.subprocess.run")
-    @patch("match_list_change_detector.get_executable_path")
+    @patch("match_list_change_detector.subprocess.Popen")
+    @patch("match_list_change_detector.get_docker_compose_command")
     @patch("match_list_change_detector.validate_file_path")
-    def test_trigger_docker_compose_timeout(self, mock_validate, mock_get_exec, mock_run):
-        """Test triggering docker-compose with a timeout."""
+    def test_trigger_docker_compose_timeout(self, mock_validate, mock_get_exec, mock_popen):
+        """Test triggering docker-compose that is still running after the check timeout."""
         # Set up the mocks
-        mock_run.side_effect = subprocess.TimeoutExpired(cmd="docker-compose", timeout=30)
-        mock_get_exec.return_value = "/usr/bin/docker-compose"
+        mock_process = MagicMock()
+        mock_process.returncode = 0
+        mock_process.wait.side_effect = [
+            subprocess.TimeoutExpired(cmd="docker-compose", timeout=2),
+            0,
+        ]
+        mock_popen.return_value = mock_process
+        mock_get_exec.return_value = ("/usr/bin/docker", "compose")
         mock_validate.return_value = Path("match_changes.json")
 
         # Create a changes dictionary
@@ -369,6 +555,63 @@ class TestMatchListChangeDetector(unittest.TestCase):
         # Verify the result
         self.assertTrue(result)  # Should return True even with a timeout
 
+    @patch("match_list_change_detector.DOCKER_COMPOSE_CHECK_SECONDS", 0.2)
+    @patch("match_list_change_detector.get_docker_compose_command")
+    def test_trigger_docker_compose_output_outlives_check(self, mock_get_command):
+        """Test that docker-compose output goes to files, not pipes it could outlive."""
+        Path("docker-compose.yml").touch()
+        changes = {"new_matches": 1, "new_match_details": [self.sample_match]}
+
+        with patch("match_list_change_detector.DOCKER_COMPOSE_FILE", "docker-compose.yml"):
+            # A command that fails straight away is reported with its stderr
+            mock_get_command.return_value = ("sh", "-c", "echo broken >&2; exit 1", "sh")
+            with self.assertLogs("match_list_change_detector", "ERROR") as logs:
+                self.assertFalse(self.detector.trigger_docker_compose(changes))
+            self.assertIn("broken", logs.output[0])
+
+            # A slow command keeps its output files after the check gives up
+            mock_get_command.return_value = ("sh", "-c", "sleep 0.5; echo done >&2", "sh")
+            processes = []
+            popen = subprocess.Popen
+
+            def spawn(*args, **kwargs):
+                processes.append(popen(*args, **kwargs))
+                return processes[-1]
+
+            with patch("match_list_change_detector.subprocess.Popen", side_effect=spawn) as p:
+                self.assertTrue(self.detector.trigger_docker_compose(changes))
+            self.assertNotEqual(p.call_args.kwargs["stderr"], subprocess.PIPE)
+            self.assertEqual(processes[0].wait(timeout=5), 0)
+
+    def test_write_file_atomic_streams_changes(self):
+        """Test that a changes summary written in chunks is the same JSON document."""
+        changes = {
+            "new_matches": 2,
+            "removed_matches": 0,
+            "new_match_details": [self.sample_match, {"matchid": 1, "lag1namn": "Åby"}],
+            "removed_match_details": [],
+        }
+
+        write_file_atomic(Path("match_changes.json"), _iter_changes_json(changes))
+
+        with open("match_changes.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), changes)
+        self.assertFalse(os.path.exists("match_changes.json.tmp"))
+
+    def test_write_file_atomic_removes_temporary_file_on_error(self):
+        """Test that a failed write keeps the old file and leaves no temporary file."""
+        Path("match_changes.json").write_bytes(b"{}")
+
+        def chunks():
+            yield b'{"new_matches":'
+            raise TypeError("not serializable")
+
+        with self.assertRaises(TypeError):
+            write_file_atomic(Path("match_changes.json"), chunks())
+
+        self.assertEqual(Path("match_changes.json").read_bytes(), b"{}")
+        self.assertFalse(os.path.exists("match_changes.json.tmp"))
+
     @patch.object(MatchListChangeDetector, "load_previous_matches")
     @patch.object(MatchListChangeDetector, "fetch_current_matches")
     @patch.object(MatchListChangeDetector, "detect_changes")
@@ -393,6 +636,8 @@ class TestMatchListChangeDetector(unittest.TestCase):
         mock_detect.assert_called_once()
         mock_trigger.assert_called_once_with({"changes": "detected"})
         mock_save.assert_called_once()
+        # The session is kept for the next run
+        self.api_client_mock.close.assert_not_called()
 
     @patch.object(MatchListChangeDetector, "load_previous_matches")
     @patch.object(MatchListChangeDetector, "fetch_current_matches")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics module.
+
+Verifies that the metrics endpoint serves the registry contents.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter
+
+from config import get_config
+from metrics import CachedMetricsApp, metrics
+
+
+class TestCachedMetricsApp(unittest.TestCase):
+    """Test cases for the CachedMetricsApp class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.registry = CollectorRegistry()
+        self.counter = Counter("test_events_total", "Test events", registry=self.registry)
+
+    @patch("metrics.time.monotonic")
+    def test_render_reuses_body_within_ttl(self, mock_monotonic):
+        """Test that scrapes within the TTL get the cached body and later ones see updates."""
+        app = CachedMetricsApp(self.registry, ttl=2.0)
+
+        mock_monotonic.return_value = 100.0
+        first = app.render()
+        self.counter.inc()
+
+        mock_monotonic.return_value = 101.0
+        self.assertIs(app.render(), first)
+
+        mock_monotonic.return_value = 102.0
+        self.assertIn(b"test_events_total 1.0", app.render())
+
+    def test_call_sets_headers(self):
+        """Test that the WSGI response carries the exposition content type and length."""
+        app = CachedMetricsApp(self.registry)
+        start_response = MagicMock()
+
+        body = b"".join(app({}, start_response))
+
+        status, headers = start_response.call_args.args
+        self.assertEqual(status, "200 OK")
+        self.assertIn(("Content-Length", str(len(body))), headers)
+        self.assertTrue(dict(headers)["Content-Type"].startswith("text/plain"))
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the Metrics class."""
+
+    def test_import_does_not_start_server(self):
+        """Test that the metrics server is only started on request."""
+        self.assertIsNone(metrics.server_thread)
+
+    def test_port_differs_from_health_server(self):
+        """Test that the metrics server does not default to the health server port."""
+        config = get_config()
+        self.assertEqual(metrics.port, int(config.get("METRICS_SERVER_PORT", 8001)))
+        self.assertNotEqual(metrics.port, int(config.get("HEALTH_SERVER_PORT", 8000)))
+
+    def test_record_changes_per_type(self):
+        """Test that each change type is counted under its own label."""
+        name = "match_list_change_detector_changes_total"
+        before = {
+            change_type: REGISTRY.get_sample_value(name, {"type": change_type})
+            for change_type in ("new", "removed", "changed")
+        }
+
+        metrics.record_changes(new=2, changed=1)
+
+        after = {
+            change_type: REGISTRY.get_sample_value(name, {"type": change_type})
+            for change_type in ("new", "removed", "changed")
+        }
+        self.assertEqual(after["new"], before["new"] + 2)
+        self.assertEqual(after["removed"], before["removed"])
+        self.assertEqual(after["changed"], before["changed"] + 1)
+
+    def test_time_api_request_observes_once(self):
+        """Test that each timed API request adds one observation to the histogram."""
+        name = "match_list_change_detector_api_response_time_seconds_count"
+        before = REGISTRY.get_sample_value(name)
+
+        with metrics.time_api_request():
+            pass
+
+        self.assertEqual(REGISTRY.get_sample_value(name), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -138,6 +138,21 @@ class TestSecurityEnhancements(unittest.TestCase):
         # Verify the number of timestamps
         self.assertEqual(len(rate_limiter.request_timestamps), 3)
 
+    @patch("match_list_change_detector.time.sleep")
+    @patch("match_list_change_detector.time.monotonic")
+    def test_rate_limiter_waits_for_oldest_request(self, mock_monotonic, mock_sleep):
+        """Test that the rate limiter sleeps until the oldest request leaves the window."""
+        rate_limiter = RateLimiter(max_requests=1, time_window=60)
+        mock_monotonic.side_effect = [100.0, 130.0, 130.0, 160.0]
+
+        self.assertEqual(rate_limiter.wait_for_next_request(), 0.0)
+        waited = rate_limiter.wait_for_next_request()
+
+        # Verify the wait and that only the new request is tracked
+        self.assertEqual(waited, 30.0)
+        mock_sleep.assert_called_once_with(30.0)
+        self.assertEqual(list(rate_limiter.request_timestamps), [160.0])
+
     def test_health_server_security_headers(self):
         """Test that the health server includes security headers."""
         # Verify that all required security headers are present